@@ -3,9 +3,13 @@ import chess
 import chess.engine
 import sys
 import os
-import pyperclip
+import concurrent.futures
+import numpy as np
 from pygame.locals import *
 
+# Posted by a one-shot timer when the AI should start thinking about its reply
+EVT_AI_THINK = pygame.USEREVENT + 1
+
 
 class ChessGame:
     def __init__(self):
@@ -19,6 +23,12 @@ class ChessGame:
         self.WIDTH, self.HEIGHT = 900, 650
         self.BOARD_SIZE = 560
         self.SQUARE_SIZE = self.BOARD_SIZE // 8
+
+        # The window is not resizable, so the board position and the pixel position of every square are fixed
+        self.board_offset = (20, (self.HEIGHT - self.BOARD_SIZE) // 2)
+        board_offset_x, board_offset_y = self.board_offset
+        self._square_px = [(board_offset_x + col * self.SQUARE_SIZE + 5, board_offset_y + row * self.SQUARE_SIZE + 5)
+                           for row in range(8) for col in range(8)]  # Piece blit position, in display order
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Chess vs Stockfish")
 
@@ -36,10 +46,14 @@ class ChessGame:
 
         # Try to load custom pieces, fallback to pygame drawing if fails
         try:
+            # List the directory once instead of stat-ing every piece file
+            with os.scandir(self.base_path) as entries:
+                present_files = {entry.name for entry in entries}
+
             for piece, file in piece_files.items():
                 path = os.path.join(self.base_path, file)
-                if os.path.exists(path):
-                    img = pygame.image.load(path)
+                if file in present_files:
+                    img = pygame.image.load(path).convert_alpha()  # Match display format for fast blits
                     self.pieces[piece] = pygame.transform.scale(img, (self.SQUARE_SIZE - 10, self.SQUARE_SIZE - 10))
                 else:
                     self.pieces = {}  # If any file is missing, use fallback drawing
@@ -56,18 +70,30 @@ class ChessGame:
         self.engine = None  # Initialize engine to None
         try:
             self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
-            self.engine.configure({"Skill Level": 10})  # Adjust skill level as needed
+            self.engine.configure({
+                "Skill Level": 10,  # Adjust skill level as needed
+                "Threads": max(1, (os.cpu_count() or 2) - 1),  # Leave one core for the UI
+                "Hash": 256
+            })
         except Exception as e:
             print(f"Error starting Stockfish: {e}")
             print("Make sure Stockfish is installed and in your PATH.")
             # Don't exit - allow human vs human play even if engine fails
 
+        # Engine searches run on a worker thread so the window keeps rendering while Stockfish thinks
+        self._engine_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._engine_future = None
+        self._engine_move_scheduled = False
+
         # Game state variables
         self.selected_square = None
         self.move_list = []
+        self._pgn_parts = []  # "1. e4 e5" style move pairs, kept in step with move_list for the clipboard
         self.player_color = chess.WHITE
         self.game_over = False
         self.valid_moves = []
+        self._valid_move_keys = set()  # (from, to, promotion) of valid_moves for constant time lookups
+        self._legal_cache = None  # legal moves grouped by from-square, reset whenever the board changes
         self.copy_success = False
         self.copy_success_time = 0
         self.vs_ai = True  # Default to AI mode
@@ -95,6 +121,20 @@ class ChessGame:
         self.move_font = pygame.font.SysFont('Arial', 18)
         self.button_font = pygame.font.SysFont('Arial', 18, bold=True)
 
+        # Labels that never change are rendered once
+        self._ai_label = self.button_font.render("AI Mode", True, self.BUTTON_TEXT_COLOR)
+        self._human_label = self.button_font.render("Human Mode", True, self.BUTTON_TEXT_COLOR)
+        self._copy_label = self.button_font.render("Copy Moves", True, self.BUTTON_TEXT_COLOR)
+        self._title_label = self.title_font.render("Move History", True, self.BLACK)
+        self._move_num_header = self.move_font.render("#", True, self.BLACK)
+        self._white_header = self.move_font.render("White", True, self.BLACK)
+        self._black_header = self.move_font.render("Black", True, self.BLACK)
+        self._up_arrow = self.font.render("▲", True, self.BLACK)
+        self._down_arrow = self.font.render("▼", True, self.BLACK)
+
+        # Rendered move list cells (SAN strings and move numbers), looked up by text
+        self._move_text_cache = {}
+
         # Move list scroll position
         self.move_scroll = 0
         self.max_visible_moves = 15
@@ -114,48 +154,85 @@ class ChessGame:
         # Clock
         self.clock = pygame.time.Clock()
 
-    def draw_board(self):
+        # Set whenever the window needs to be redrawn, run() sleeps on input while it is clear
+        self._dirty = True
+
+        # Screen regions pushed to the display on the next frame, the first frame presents the whole window
+        self._dirty_rects = []
+        self._full_redraw = True
+        self.board_rect = pygame.Rect(board_offset_x - 2, board_offset_y - 2, self.BOARD_SIZE + 4, self.BOARD_SIZE + 4)
+        self.panel_rect = None
+
+        # Static board graphic (squares, coordinates, border) never changes, so render it once
+        self._board_bg = self._build_board_background()
+
+        # Reusable overlays for the selected square and capturable squares
+        self._highlight_surf = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        self._highlight_surf.fill(self.HIGHLIGHT)
+        self._capture_surf = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        self._capture_surf.fill((255, 0, 0, 100))  # Semi-transparent red
+
+        # Valid-move dot for empty destination squares, pre-rendered with a color key around the circle
+        self._move_marker_surf = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE)).convert()
+        self._move_marker_surf.fill((255, 0, 255))
+        self._move_marker_surf.set_colorkey((255, 0, 255))
+        pygame.draw.circle(self._move_marker_surf, self.VALID_MOVE_COLOR,
+                           (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2), self.SQUARE_SIZE // 6)
+
+    def _build_board_background(self):
         """
-        renders chess board and its elements in pygame window
-        :return:
+        renders the chess board squares, coordinates and border onto a surface once so it can be blitted every frame
+        :return: surface of size BOARD_SIZE + 4 with the board drawn at offset (2, 2)
         """
-        board_offset_x = 20
-        board_offset_y = (self.HEIGHT - self.BOARD_SIZE) // 2
+        board_bg = pygame.Surface((self.BOARD_SIZE + 4, self.BOARD_SIZE + 4))
+
+        # Build every square's pixels in one go: dark where (row + col) is odd, light elsewhere
+        mask = (np.add.outer(np.arange(8), np.arange(8)) & 1).repeat(self.SQUARE_SIZE, 0).repeat(self.SQUARE_SIZE, 1)
+        pixels = np.zeros((self.BOARD_SIZE + 4, self.BOARD_SIZE + 4, 3), dtype=np.uint8)
+        pixels[2:2 + self.BOARD_SIZE, 2:2 + self.BOARD_SIZE] = np.where(mask[:, :, None],
+                                                                        np.array(self.DARK_SQUARE, dtype=np.uint8),
+                                                                        np.array(self.LIGHT_SQUARE, dtype=np.uint8))
+        pygame.surfarray.blit_array(board_bg, pixels.swapaxes(0, 1))  # surfarray is indexed (x, y)
 
-        # Draw the chess board
         for row in range(8):
             for col in range(8):
-                x = board_offset_x + col * self.SQUARE_SIZE
-                y = board_offset_y + row * self.SQUARE_SIZE
+                x = 2 + col * self.SQUARE_SIZE
+                y = 2 + row * self.SQUARE_SIZE
                 color = self.LIGHT_SQUARE if (row + col) % 2 == 0 else self.DARK_SQUARE
-                pygame.draw.rect(self.screen, color, (x, y, self.SQUARE_SIZE, self.SQUARE_SIZE))
 
                 # Draw coordinates
                 if col == 0:  # Ranks (numbers)
                     text = self.font.render(str(8 - row), True,
                                             self.BLACK if color == self.LIGHT_SQUARE else self.WHITE)
-                    self.screen.blit(text, (x + 5, y + 5))
+                    board_bg.blit(text, (x + 5, y + 5))
                 if row == 7:  # Files (letters)
                     text = self.font.render(chr(97 + col), True,
                                             self.BLACK if color == self.LIGHT_SQUARE else self.WHITE)
-                    self.screen.blit(text, (x + self.SQUARE_SIZE - 15, y + self.SQUARE_SIZE - 20))
+                    board_bg.blit(text, (x + self.SQUARE_SIZE - 15, y + self.SQUARE_SIZE - 20))
 
         # Draw board border
-        pygame.draw.rect(self.screen, self.BLACK,
-                         (board_offset_x - 2, board_offset_y - 2,
-                          self.BOARD_SIZE + 4, self.BOARD_SIZE + 4), 2)
+        pygame.draw.rect(board_bg, self.BLACK, (0, 0, self.BOARD_SIZE + 4, self.BOARD_SIZE + 4), 2)
+
+        return board_bg
+
+    def draw_board(self):
+        """
+        renders chess board and its elements in pygame window
+        :return: none
+        """
+        board_offset_x, board_offset_y = self.board_offset
+
+        # Draw the pre-rendered chess board (squares, coordinates and border)
+        self.screen.blit(self._board_bg, (board_offset_x - 2, board_offset_y - 2))
 
         # Highlight selected square if any
         if self.selected_square is not None:
             col, row = self.selected_square % 8, self.selected_square // 8
             x = board_offset_x + col * self.SQUARE_SIZE
             y = board_offset_y + (7 - row) * self.SQUARE_SIZE  # Flip row for display
-            highlight = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
-            highlight.fill(self.HIGHLIGHT)
-            self.screen.blit(highlight, (x, y))
+            overlays = [(self._highlight_surf, (x, y))]
 
-            # Calculate and highlight valid moves
-            self.valid_moves = [move for move in self.board.legal_moves if move.from_square == self.selected_square]
+            # Highlight valid moves
             for move in self.valid_moves:
                 to_col, to_row = move.to_square % 8, move.to_square // 8
                 to_x = board_offset_x + to_col * self.SQUARE_SIZE
@@ -165,48 +242,76 @@ class ChessGame:
                 to_piece = self.board.piece_at(move.to_square)
                 if to_piece and to_piece.color != self.player_color:
                     # Draw a semi-transparent red square
-                    capture = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
-                    capture.fill((255, 0, 0, 100))  # Semi-transparent red
-                    self.screen.blit(capture, (to_x, to_y))
+                    overlays.append((self._capture_surf, (to_x, to_y)))
                 else:
                     # Draw a circle for empty square moves
-                    pygame.draw.circle(self.screen, self.VALID_MOVE_COLOR,
-                                       (to_x + self.SQUARE_SIZE // 2, to_y + self.SQUARE_SIZE // 2),
-                                       self.SQUARE_SIZE // 6)
+                    overlays.append((self._move_marker_surf, (to_x, to_y)))
 
-        return board_offset_x, board_offset_y
+            # All overlays are pooled surfaces, so the whole set goes out in one call
+            self.screen.blits(overlays, doreturn=False)
 
-    def draw_pieces(self, board_offset_x, board_offset_y):
+    def _mark_dirty(self, *rects):
         """
-        renders chess pieces in the board
-        :param board_offset_x: top left x coordinate
-        :param board_offset_y: top left y coordinate
+        schedules a redraw and records which parts of the screen have to be pushed to the display
+        :param rects: regions that changed, the whole window is presented when none are given (or not known yet)
         :return: none
         """
-        # Draw the chess pieces on the board
-        for row in range(8):
-            for col in range(8):
-                square = chess.square(col, 7 - row)  # Convert to chess.py coordinates
-                piece = self.board.piece_at(square)
+        self._dirty = True
+        if not rects or None in rects:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.extend(rects)
+
+    def _render_move_text(self, text):
+        """
+        renders a move list cell with the move font, each distinct string is only rendered once
+        :param text: SAN move or move number to render
+        :return: rendered text surface
+        """
+        surface = self._move_text_cache.get(text)
+        if surface is None:
+            surface = self.move_font.render(text, True, self.BLACK)
+            self._move_text_cache[text] = surface
+        return surface
 
-                if piece:
-                    x = board_offset_x + col * self.SQUARE_SIZE + 5  # Center the piece
-                    y = board_offset_y + row * self.SQUARE_SIZE + 5
-                    piece_symbol = piece.symbol()
-
-                    # Check if we have the image for this piece, if we do draw that piece
-                    if piece_symbol in self.pieces:
-                        self.screen.blit(self.pieces[piece_symbol], (x, y))
-                    else:
-                        # Fallback: draw colored circles with letters
-                        color = self.WHITE if piece.color == chess.WHITE else self.BLACK
-                        pygame.draw.circle(self.screen, color,
-                                           (x + self.SQUARE_SIZE // 2 - 5, y + self.SQUARE_SIZE // 2 - 5),
-                                           self.SQUARE_SIZE // 2 - 5)
-                        text = self.font.render(piece_symbol, True,
-                                                self.BLACK if piece.color == chess.WHITE else self.WHITE)
-                        text_rect = text.get_rect(center=(x + self.SQUARE_SIZE // 2 - 5, y + self.SQUARE_SIZE // 2 - 5))
-                        self.screen.blit(text, text_rect)
+    def _get_legal_by_from(self):
+        """
+        groups the legal moves of the current position by their from-square, built at most once per ply
+        :return: dict mapping from-square to the list of legal moves starting there
+        """
+        if self._legal_cache is None:
+            self._legal_cache = {}
+            for move in self.board.legal_moves:
+                self._legal_cache.setdefault(move.from_square, []).append(move)
+        return self._legal_cache
+
+    def draw_pieces(self):
+        """
+        renders chess pieces in the board
+        :return: none
+        """
+        # Draw the chess pieces on the board, visiting only the occupied squares
+        blit_seq = []
+        for square, piece in self.board.piece_map().items():
+            x, y = self._square_px[(7 - (square >> 3)) * 8 + (square & 7)]  # Flip rank for display order
+            piece_symbol = piece.symbol()
+
+            # Check if we have the image for this piece, if we do queue that piece
+            if piece_symbol in self.pieces:
+                blit_seq.append((self.pieces[piece_symbol], (x, y)))
+            else:
+                # Fallback: draw colored circles with letters
+                color = self.WHITE if piece.color == chess.WHITE else self.BLACK
+                pygame.draw.circle(self.screen, color,
+                                   (x + self.SQUARE_SIZE // 2 - 5, y + self.SQUARE_SIZE // 2 - 5),
+                                   self.SQUARE_SIZE // 2 - 5)
+                text = self.font.render(piece_symbol, True,
+                                        self.BLACK if piece.color == chess.WHITE else self.WHITE)
+                text_rect = text.get_rect(center=(x + self.SQUARE_SIZE // 2 - 5, y + self.SQUARE_SIZE // 2 - 5))
+                self.screen.blit(text, text_rect)
+
+        # Blit all piece images in a single call
+        self.screen.blits(blit_seq, doreturn=False)
 
     def draw_buttons(self):
         """Draw buttons for AI vs Human and copy moves at the bottom of the screen."""
@@ -224,7 +329,7 @@ class ChessGame:
         pygame.draw.rect(self.screen, ai_button_color, self.ai_button_rect, border_radius=5)
         pygame.draw.rect(self.screen, self.BLACK, self.ai_button_rect, 1, border_radius=5)
 
-        ai_text = self.button_font.render("AI Mode", True, self.BUTTON_TEXT_COLOR)
+        ai_text = self._ai_label
         ai_text_rect = ai_text.get_rect(center=self.ai_button_rect.center)
         self.screen.blit(ai_text, ai_text_rect)
 
@@ -236,7 +341,7 @@ class ChessGame:
         pygame.draw.rect(self.screen, human_button_color, self.human_button_rect, border_radius=5)
         pygame.draw.rect(self.screen, self.BLACK, self.human_button_rect, 1, border_radius=5)
 
-        human_text = self.button_font.render("Human Mode", True, self.BUTTON_TEXT_COLOR)
+        human_text = self._human_label
         human_text_rect = human_text.get_rect(center=self.human_button_rect.center)
         self.screen.blit(human_text, human_text_rect)
 
@@ -248,7 +353,7 @@ class ChessGame:
         pygame.draw.rect(self.screen, button_color, self.copy_button_rect, border_radius=5)
         pygame.draw.rect(self.screen, self.BLACK, self.copy_button_rect, 1, border_radius=5)
 
-        copy_text = self.button_font.render("Copy Moves", True, self.BUTTON_TEXT_COLOR)
+        copy_text = self._copy_label
         copy_text_rect = copy_text.get_rect(center=self.copy_button_rect.center)
         self.screen.blit(copy_text, copy_text_rect)
 
@@ -264,7 +369,7 @@ class ChessGame:
         pygame.draw.rect(self.screen, self.BLACK, (panel_x, panel_y, panel_width, panel_height), 2)
 
         # Title
-        title = self.title_font.render("Move History", True, self.BLACK)
+        title = self._title_label
         title_rect = title.get_rect(center=(panel_x + panel_width // 2, panel_y + 20))
         self.screen.blit(title, title_rect)
 
@@ -288,16 +393,14 @@ class ChessGame:
             up_rect = pygame.Rect(panel_x + panel_width - 30, panel_y + 70, 20, 20)
             pygame.draw.rect(self.screen, (200, 200, 200), up_rect)
             pygame.draw.rect(self.screen, self.BLACK, up_rect, 1)
-            up_arrow = self.font.render("▲", True, self.BLACK)
-            self.screen.blit(up_arrow, (up_rect.centerx - 5, up_rect.centery - 7))
+            self.screen.blit(self._up_arrow, (up_rect.centerx - 5, up_rect.centery - 7))
             self.scroll_up_rect = up_rect
 
             # Down button
             down_rect = pygame.Rect(panel_x + panel_width - 30, panel_y + panel_height - 90, 20, 20)
             pygame.draw.rect(self.screen, (200, 200, 200), down_rect)
             pygame.draw.rect(self.screen, self.BLACK, down_rect, 1)
-            down_arrow = self.font.render("▼", True, self.BLACK)
-            self.screen.blit(down_arrow, (down_rect.centerx - 5, down_rect.centery - 7))
+            self.screen.blit(self._down_arrow, (down_rect.centerx - 5, down_rect.centery - 7))
             self.scroll_down_rect = down_rect
         else:
             self.scroll_up_rect = None
@@ -309,13 +412,9 @@ class ChessGame:
         pygame.draw.line(self.screen, self.BLACK, (panel_x + 10, header_y + 25),
                          (panel_x + panel_width - 10, header_y + 25))
 
-        move_num_header = self.move_font.render("#", True, self.BLACK)
-        white_header = self.move_font.render("White", True, self.BLACK)
-        black_header = self.move_font.render("Black", True, self.BLACK)
-
-        self.screen.blit(move_num_header, (panel_x + 20, header_y + 5))
-        self.screen.blit(white_header, (panel_x + 60, header_y + 5))
-        self.screen.blit(black_header, (panel_x + 170, header_y + 5))
+        self.screen.blit(self._move_num_header, (panel_x + 20, header_y + 5))
+        self.screen.blit(self._white_header, (panel_x + 60, header_y + 5))
+        self.screen.blit(self._black_header, (panel_x + 170, header_y + 5))
 
         # Draw move list
         moves_start_y = header_y + 30
@@ -326,7 +425,7 @@ class ChessGame:
             row_y = moves_start_y + (i - self.move_scroll) * 30
 
             # Move number
-            move_num = self.move_font.render(f"{i + 1}.", True, self.BLACK)
+            move_num = self._render_move_text(f"{i + 1}.")
             self.screen.blit(move_num, (panel_x + 20, row_y + 5))
 
             # White's move
@@ -335,7 +434,7 @@ class ChessGame:
                 pygame.draw.rect(self.screen, self.MOVE_WHITE_BG, white_bg)
                 pygame.draw.rect(self.screen, self.BLACK, white_bg, 1)
 
-                white_move = self.move_font.render(self.move_list[move_row], True, self.BLACK)
+                white_move = self._render_move_text(self.move_list[move_row])
                 white_rect = white_move.get_rect(center=(white_bg.centerx, white_bg.centery))
                 self.screen.blit(white_move, white_rect)
 
@@ -345,7 +444,7 @@ class ChessGame:
                 pygame.draw.rect(self.screen, self.MOVE_BLACK_BG, black_bg)
                 pygame.draw.rect(self.screen, self.BLACK, black_bg, 1)
 
-                black_move = self.move_font.render(self.move_list[move_row + 1], True, self.BLACK)
+                black_move = self._render_move_text(self.move_list[move_row + 1])
                 black_rect = black_move.get_rect(center=(black_bg.centerx, black_bg.centery))
                 self.screen.blit(black_move, black_rect)
 
@@ -361,6 +460,7 @@ class ChessGame:
         turn_rect = turn_surface.get_rect(center=(panel_x + panel_width // 2, panel_y + panel_height - 40))
         self.screen.blit(turn_surface, turn_rect)
 
+        self.panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
         return panel_x, panel_width
 
     def format_moves_for_clipboard(self):
@@ -368,23 +468,25 @@ class ChessGame:
         if not self.move_list:
             return "No moves played yet"
 
-        formatted_text = ""
-        for i in range(0, len(self.move_list), 2):
-            move_num = i // 2 + 1
-            white_move = self.move_list[i]
-
-            if i + 1 < len(self.move_list):
-                black_move = self.move_list[i + 1]
-                formatted_text += f"{move_num}. {white_move} {black_move} "
-            else:
-                formatted_text += f"{move_num}. {white_move} "
+        return " ".join(self._pgn_parts)
 
-        return formatted_text.strip()
+    def add_move_to_list(self, san):
+        """
+        records a played move in the move list and in the clipboard move pairs
+        :param san: move in standard algebraic notation
+        :return: none
+        """
+        self.move_list.append(san)
+        if len(self.move_list) % 2 == 1:  # White's move starts a new pair
+            self._pgn_parts.append(f"{(len(self.move_list) + 1) // 2}. {san}")
+        else:
+            self._pgn_parts[-1] += f" {san}"
 
     def copy_moves_to_clipboard(self):
         """Copy the game moves to clipboard"""
         formatted_moves = self.format_moves_for_clipboard()
         try:
+            import pyperclip  # Deferred: probes the platform clipboard on import, only needed once the user copies
             pyperclip.copy(formatted_moves)
             self.copy_success = True
             self.copy_success_time = pygame.time.get_ticks()
@@ -402,10 +504,12 @@ class ChessGame:
             # Always promote to queen for simplicity (could add a dialog for options)
             move = chess.Move(from_square, to_square, promotion=chess.QUEEN)
 
-        if move in self.valid_moves:
+        if (move.from_square, move.to_square, move.promotion) in self._valid_move_keys:
             san = self.board.san(move)
             self.board.push(move)
-            self.move_list.append(san)
+            self._legal_cache = None
+            self.add_move_to_list(san)
+            self._mark_dirty(self.board_rect, self.panel_rect)
 
             # Auto-scroll to the bottom of move list
             total_move_rows = (len(self.move_list) + 1) // 2
@@ -413,42 +517,121 @@ class ChessGame:
             return True
         return False
 
+    def schedule_engine_move(self):
+        """
+        starts the engine's reply after a short delay for better user experience, without blocking the event loop
+        :return: none
+        """
+        if self.engine is not None and self._engine_future is None and not self._engine_move_scheduled:
+            self._engine_move_scheduled = True
+            pygame.time.set_timer(EVT_AI_THINK, 300, loops=1)
+
     def make_engine_move(self):
-        if self.engine is not None:
-            result = self.engine.play(self.board, chess.engine.Limit(time=1.0))
-            san = self.board.san(result.move)
-            self.board.push(result.move)
-            self.move_list.append(san)
+        """
+        starts a Stockfish search for the current position on the engine thread, the move is applied by
+        apply_engine_move() once the search is done
+        :return: none
+        """
+        if self.engine is not None and self._engine_future is None:
+            # Depth cap returns early in simple positions, and the engine goes idle once it has replied.
+            # The worker gets its own copy so the UI board is never shared across threads. The copy keeps the move
+            # history, which Stockfish needs to see repetitions
+            self._engine_future = self._engine_executor.submit(self.engine.play, self.board.copy(),
+                                                               chess.engine.Limit(time=1.0, depth=14))
+
+    def apply_engine_move(self):
+        """
+        pushes the move found by the finished engine search onto the board
+        :return: none
+        """
+        future, self._engine_future = self._engine_future, None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Engine move failed: {e}")
+            return
 
-            # Auto-scroll to the bottom of move list
-            total_move_rows = (len(self.move_list) + 1) // 2
-            self.move_scroll = max(0, total_move_rows - self.max_visible_moves)
+        san = self.board.san(result.move)
+        self.board.push(result.move)
+        self._legal_cache = None
+        self.add_move_to_list(san)
+        self._mark_dirty(self.board_rect, self.panel_rect)
 
-    def handle_click(self, pos, board_offset_x, board_offset_y, panel_x, panel_width):
+        # Auto-scroll to the bottom of move list
+        total_move_rows = (len(self.move_list) + 1) // 2
+        self.move_scroll = max(0, total_move_rows - self.max_visible_moves)
+
+        # Check if the game is over after the engine's move
+        self.is_game_over()
+
+    def cancel_engine_move(self):
+        """
+        drops a pending engine search so its result is never applied (e.g. after a mode change)
+        :return: none
+        """
+        if self._engine_move_scheduled:
+            pygame.time.set_timer(EVT_AI_THINK, 0)
+            self._engine_move_scheduled = False
+        if self._engine_future is not None:
+            self._engine_future.cancel()
+            self._engine_future = None
+
+    def select_square(self, square):
+        """
+        selects a square and looks up its legal moves once, so drawing and move checks can reuse them
+        :param square: chess square index to select, or None to clear the selection
+        :return: none
+        """
+        self.selected_square = square
+        self.valid_moves = [] if square is None else self._get_legal_by_from().get(square, [])
+        self._valid_move_keys = {(m.from_square, m.to_square, m.promotion) for m in self.valid_moves}
+
+    def square_at(self, pos):
+        """
+        converts a window position to the chess square drawn under it
+        :param pos: (x, y) position in the window
+        :return: chess square index, or None if the position is outside the board
+        """
+        board_offset_x, board_offset_y = self.board_offset
+        col = (pos[0] - board_offset_x) // self.SQUARE_SIZE
+        row = (pos[1] - board_offset_y) // self.SQUARE_SIZE
+        if not (0 <= col < 8 and 0 <= row < 8):
+            return None
+        return (7 - row) * 8 + col  # Flip row for chess coordinates
+
+    def handle_click(self, pos, panel_x, panel_width):
         total_move_rows = (len(self.move_list) + 1) // 2
         max_scroll = max(0, total_move_rows - self.max_visible_moves)
 
         # Check if click is on the AI/Human buttons
         if self.ai_button_rect and self.ai_button_rect.collidepoint(pos):
             self.vs_ai = True
+            self.cancel_engine_move()
             self.board.reset()  # Reset the board on mode change
+            self._legal_cache = None
             self.move_list = []
+            self._pgn_parts = []
             self.move_scroll = 0
-            self.selected_square = None
+            self.select_square(None)
 
             self.player_color = chess.WHITE
+            self._mark_dirty()
             if self.engine is None:
                 print("Stockfish engine not available")
             return  # Important, exit as nothing else is to be done
 
         if self.human_button_rect and self.human_button_rect.collidepoint(pos):
             self.vs_ai = False
+            self.cancel_engine_move()
             self.board.reset()  # Reset the board on mode change
+            self._legal_cache = None
             self.move_list = []
+            self._pgn_parts = []
             self.move_scroll = 0
-            self.selected_square = None
+            self.select_square(None)
 
             self.player_color = chess.WHITE
+            self._mark_dirty()
             return  # Important, exit as nothing else is to be done
 
         # Check if click is on the copy button
@@ -460,21 +643,21 @@ class ChessGame:
         if self.scroll_up_rect and self.scroll_up_rect.collidepoint(pos):
             if self.move_scroll > 0:
                 self.move_scroll -= 1
+                self._mark_dirty(self.panel_rect)
             return
 
         if self.scroll_down_rect and self.scroll_down_rect.collidepoint(pos):
             if self.move_scroll < max_scroll:
                 self.move_scroll += 1
+                self._mark_dirty(self.panel_rect)
             return
 
         # Check if click is on the board
-        if (board_offset_x <= pos[0] <= board_offset_x + self.BOARD_SIZE and
-                board_offset_y <= pos[1] <= board_offset_y + self.BOARD_SIZE):
-
-            # Convert click position to board square
-            col = (pos[0] - board_offset_x) // self.SQUARE_SIZE
-            row = 7 - (pos[1] - board_offset_y) // self.SQUARE_SIZE  # Flip row for chess coordinates
-            square = chess.square(col, row)
+        square = self.square_at(pos)
+        if square is not None:
+            if self._engine_future is not None or self._engine_move_scheduled:  # Locked while the AI moves
+                return
+            self._mark_dirty(self.board_rect)  # Selection highlight changes
 
             # If a square is already selected, try to move
             if self.selected_square is not None:
@@ -487,19 +670,13 @@ class ChessGame:
                          (square >= 56 and self.player_color == chess.BLACK))):
                     move = chess.Move(self.selected_square, square, promotion=chess.QUEEN)
 
-                if move in self.valid_moves:
+                if (move.from_square, move.to_square, move.promotion) in self._valid_move_keys:
                     if self.make_player_move(self.selected_square, square):
-                        self.selected_square = None
-                        self.valid_moves = []
+                        self.select_square(None)
 
                         # If the game is not over, and we are playing against AI, make the engine's move
                         if not self.is_game_over() and self.vs_ai:
-                            # Add a small delay before engine move for better user experience
-                            pygame.time.delay(300)
-                            self.make_engine_move()
-
-                            # Check if the game is over after the engine's move
-                            self.is_game_over()
+                            self.schedule_engine_move()
                         else:
                             # Switch player turn if it's human vs human
                             self.player_color = not self.player_color
@@ -509,17 +686,16 @@ class ChessGame:
                 # If not a valid move, select the new square if it has a piece of the player's color
                 piece = self.board.piece_at(square)
                 if piece and piece.color == self.board.turn and (self.vs_ai or self.board.turn == self.player_color):
-                    self.selected_square = square
+                    self.select_square(square)
                     return
                 else:
-                    self.selected_square = None
-                    self.valid_moves = []
+                    self.select_square(None)
                     return
 
             # No square selected yet, select if it has a piece of the player's color
             piece = self.board.piece_at(square)
             if piece and piece.color == self.board.turn and (self.vs_ai or self.board.turn == self.player_color):
-                self.selected_square = square
+                self.select_square(square)
 
     def is_game_over(self):
         if self.board.is_game_over():
@@ -531,20 +707,66 @@ class ChessGame:
         if self.copy_button_rect:
             self.copy_button_hover = self.copy_button_rect.collidepoint(mouse_pos)
 
+    def draw_frame(self):
+        """
+        redraws the whole window: board, pieces, move list and buttons
+        :return: none
+        """
+        # Clear the screen
+        self.screen.fill((230, 230, 230))  # Light gray background
+
+        # Draw the board and pieces
+        self.draw_board()
+        self.draw_pieces()
+
+        # Draw the move list
+        self.move_panel_info = self.draw_move_list()
+
+        # Draw buttons
+        self.draw_buttons()
+
+        # Update the display, only the regions that changed unless the whole window is stale
+        if self._full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects = []
+        self._full_redraw = False
+
     def run(self):
         running = True
         while running:
-            mouse_pos = pygame.mouse.get_pos()
+            # Only spin when the AI has to move, otherwise sleep until input arrives (or the timeout expires)
+            ai_to_move = (self.vs_ai and not self.game_over and self.engine is not None and
+                          self.board.turn != self.player_color)
+            if ai_to_move or self._dirty:
+                events = pygame.event.get()
+            else:
+                events = [pygame.event.wait(100)] + pygame.event.get()
+
+            # Coalesce all mouse motion in the batch down to the most recent position
+            last_motion = next((e for e in reversed(events) if e.type == pygame.MOUSEMOTION), None)
+            mouse_pos = last_motion.pos if last_motion else pygame.mouse.get_pos()
+            was_hovering = self.copy_button_hover
             self.update_button_hover(mouse_pos)
+            if self.copy_button_hover != was_hovering:
+                self._mark_dirty(self.copy_button_rect)
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:  # Window uncovered or restored
+                    self._mark_dirty()
+                elif event.type == EVT_AI_THINK:
+                    self._engine_move_scheduled = False
+                    if self.vs_ai and not self.game_over and self.board.turn != self.player_color:
+                        self.make_engine_move()
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-                    self.handle_click(event.pos, *self.board_panel_info, *self.move_panel_info)
+                    self.handle_click(event.pos, *self.move_panel_info)
 
                 # Add mouse wheel scrolling
                 elif event.type == pygame.MOUSEWHEEL:
+                    self._mark_dirty(self.panel_rect)
                     total_move_rows = (len(self.move_list) + 1) // 2
                     max_scroll = max(0, total_move_rows - self.max_visible_moves)
 
@@ -553,31 +775,23 @@ class ChessGame:
                     elif event.y < 0 and self.move_scroll < max_scroll:  # Scroll down
                         self.move_scroll = min(max_scroll, self.move_scroll + 1)
 
-            # Clear the screen
-            self.screen.fill((230, 230, 230))  # Light gray background
-
-            # Draw the board and pieces
-            self.board_panel_info = self.draw_board()
-            self.draw_pieces(*self.board_panel_info)
-
-            # Draw the move list
-            self.move_panel_info = self.draw_move_list()
+            if self._dirty:
+                self.draw_frame()
+                self._dirty = False
 
-            # Draw buttons
-            self.draw_buttons()
-
-            # Update the display
-            pygame.display.flip()
+            # Collect the engine's move once the background search has finished
+            if self._engine_future is not None and self._engine_future.done():
+                self.apply_engine_move()
 
             # If its AI's turn, make the AI move
             if self.vs_ai and not self.game_over and self.board.turn != self.player_color:
-                pygame.time.delay(300)
-                self.make_engine_move()
+                self.schedule_engine_move()
 
             # Cap the frame rate
             self.clock.tick(60)
 
         # Quit the game and close the engine
+        self._engine_executor.shutdown(wait=False, cancel_futures=True)
         if self.engine:
             self.engine.quit()
         pygame.quit()
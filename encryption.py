@@ -1,90 +1,420 @@
 # =================================================IMPORT STATEMENTS====================================================
 import hashlib
+import hmac
+from functools import partial
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 # ======================================================================================================================
 
+# hash functions ChessKeyGenerator can derive the 32 byte key with, both sides of an exchange must use the same one
+KEY_HASH_ALGORITHMS = {
+    'sha256': hashlib.sha256,  # default, fastest on CPUs with SHA extensions
+    'blake2b': partial(hashlib.blake2b, digest_size=32)  # usually faster in software on CPUs without them
+}
+
+# PKCS7 padding for every possible length (1..16 bytes), PKCS7_PADDING[n - 1] is n copies of byte n
+PKCS7_PADDING = tuple(bytes((length,)) * length for length in range(1, 17))
+
+# random bytes are read from the OS in blocks of this size and handed out as initialization vectors
+RANDOM_POOL_SIZE = 4096
+_randomPool = threading.local()  # every thread slices from its own block, so no IV is ever handed out twice
+if hasattr(os, 'register_at_fork'):
+    # a forked child must not hand out the same IVs as its parent
+    os.register_at_fork(after_in_child=lambda: _randomPool.__dict__.clear())
+
+# set CBESS_REQUIRE_AESNI=1 to refuse to import on hosts where AES-NI can not be confirmed, instead of silently running
+# several times slower on OpenSSL's software AES
+REQUIRE_AESNI_VARIABLE = 'CBESS_REQUIRE_AESNI'
+
+
+# ============================================================HELPERS===================================================
+def getRandomBytes(size: int = 16) -> bytes:
+    """
+    returns fresh random bytes for initialization vectors, served from a per-thread block of os.urandom output so
+    that one getrandom() syscall covers many encryptions
+    :param size: number of random bytes needed (16 for an AES initialization vector)
+    :return: random bytes, never returned to any other caller
+    """
+    if size > RANDOM_POOL_SIZE:
+        return os.urandom(size)
+
+    pool = getattr(_randomPool, 'buffer', b'')
+    offset = getattr(_randomPool, 'offset', 0)
+    if offset + size > len(pool):
+        pool = os.urandom(RANDOM_POOL_SIZE)
+        offset = 0
+        _randomPool.buffer = pool
+
+    _randomPool.offset = offset + size
+    return pool[offset: offset + size]
+
+
+def getCryptoAcceleration() -> dict:
+    """
+    reports which OpenSSL build the cryptography package runs on and whether the CPU has the AES (AES-NI), PCLMULQDQ
+    and SHA (SHA-NI) instructions OpenSSL uses for its fast paths. The probe runs once, later calls return the cached
+    result
+    :return: dict with 'openssl' (version text or None) and 'aes', 'pclmulqdq', 'sha' (True/False, or None when the
+    CPU flags could not be read on this platform)
+    """
+    global _accelerationInfo
+    if _accelerationInfo is not None:
+        return _accelerationInfo
+
+    try:
+        from cryptography.hazmat.backends.openssl.backend import backend
+        opensslVersion = backend.openssl_version_text()
+    except (ImportError, AttributeError):
+        opensslVersion = None
+
+    cpuFlags = None
+    try:
+        with open('/proc/cpuinfo') as cpuInfoFile:
+            for line in cpuInfoFile:
+                if line.startswith(('flags', 'Features')):  # x86 lists 'flags', ARM lists 'Features'
+                    cpuFlags = set(line.partition(':')[2].split())
+                    break
+    except OSError:
+        pass  # not Linux, the flags are unknown rather than missing
+
+    def hasFlag(*names):
+        return None if cpuFlags is None else any(name in cpuFlags for name in names)
+
+    _accelerationInfo = {
+        'openssl': opensslVersion,
+        'aes': hasFlag('aes'),  # the ARMv8 crypto extension reports 'aes' as well
+        'pclmulqdq': hasFlag('pclmulqdq', 'pmull'),
+        'sha': hasFlag('sha_ni', 'sha2')
+    }
+    return _accelerationInfo
+
+
+def requireAESAcceleration():
+    """
+    raises RuntimeError unless AES hardware acceleration is confirmed on this host
+    """
+    info = getCryptoAcceleration()
+    if not info['aes']:
+        reason = "could not be detected" if info['aes'] is None else "is not available"
+        raise RuntimeError(f"AES hardware acceleration {reason} on this host (OpenSSL: {info['openssl']}), "
+                           f"unset {REQUIRE_AESNI_VARIABLE} to run on software AES")
+
+
+_accelerationInfo = None
+if os.environ.get(REQUIRE_AESNI_VARIABLE) == '1':
+    requireAESAcceleration()
+# ============================================================HELPERS===================================================
+
 
 # ============================================================CLASSES===================================================
 class ChessKeyGenerator:
     """
     Converts sequence of chess moves into 32 byte key suitable for AES-256 encryption
     """
-    def __init__(self, moves: str):
+    def __init__(self, moves, algorithm: str = 'sha256'):
         """
         this constructor takes chess moves as string and stores them in self.moves instance variable
-        :param moves: The string of chess moves to be converted to 32 byte key
+        :param moves: The string of chess moves to be converted to 32 byte key, or the moves already UTF-8 encoded
+        (bytes-like), which are hashed as they are
+        :param algorithm: hash used for the key, 'sha256' (default) or 'blake2b' (BLAKE2b with a 32 byte digest)
         """
+        if algorithm not in KEY_HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported key hash algorithm: {algorithm}")
+        self.algorithm = algorithm
         self.moves = moves
 
+    @property
+    def moves(self) -> str:
+        """
+        the chess moves the key is derived from
+        :return: the moves as a string
+        """
+        return self._moves
+
+    @moves.setter
+    def moves(self, moves):
+        """
+        replaces the moves, resetting the encoded moves, the running hash and the cached key so they follow the new
+        moves
+        :param moves: the chess moves as a string, or already UTF-8 encoded (bytes-like)
+        """
+        if isinstance(moves, str):
+            movesBytes = moves.encode('utf-8')  # string -> bytes, kept for callers that need the encoded moves
+        else:
+            movesBytes = bytes(moves)
+            moves = movesBytes.decode('utf-8')  # also validates that the bytes are UTF-8
+        self._moves = moves
+        self._movesBytes = movesBytes
+        self._key = None  # derived on the first generateKey call, reused until the moves change
+        self._hashObject = KEY_HASH_ALGORITHMS[self.algorithm](movesBytes)  # feeds the byte for hashing
+
+    @property
+    def movesBytes(self) -> bytes:
+        """
+        the moves encoded as UTF-8, encoded once and reused (e.g. for embedding the key source in an image)
+        :return: UTF-8 bytes of self.moves
+        """
+        if self._movesBytes is None:
+            self._movesBytes = self.moves.encode('utf-8')
+        return self._movesBytes
+
+    def appendMove(self, move: str):
+        """
+        adds a move to the end of self.moves (space separated) and feeds only that move into the running hash, so
+        growing the game one move at a time never rehashes the earlier moves
+        :param move: the chess move to append
+        """
+        addedText = move if not self._moves else " " + move
+        self._moves += addedText
+        self._movesBytes = None  # re-encoded only if someone asks for it
+        self._key = None
+        self._hashObject.update(addedText.encode('utf-8'))
+
     def generateKey(self) -> bytes:
         """
         this method generates a 32 byte key suitable for AES-256 encryption
-        :return: a 32 byte SHA-256 hash suitable for AES-256 32 byte key
+        :return: a 32 byte SHA-256 (or BLAKE2b-256) hash suitable for AES-256 32 byte key
         """
-        sha256HashObject32Byte = hashlib.sha256()
-        sha256HashObject32Byte.update(self.moves.encode('utf-8')) # string -> bytes -> feeds the byte for hashing
-        return sha256HashObject32Byte.digest()[:32]
+        if self._key is None:
+            # copy keeps the running hash open for further appendMove calls
+            self._key = self._hashObject.copy().digest()
+        return self._key
+
+    @classmethod
+    def generateKeyFromBytes(cls, movesBytes: bytes, algorithm: str = 'sha256') -> bytes:
+        """
+        generates the same 32 byte key as generateKey for moves that are already UTF-8 encoded, skipping the encode
+        :param movesBytes: UTF-8 encoded string of chess moves
+        :param algorithm: hash used for the key, 'sha256' (default) or 'blake2b'
+        :return: a 32 byte hash suitable for AES-256 32 byte key (both digests are always 32 bytes)
+        """
+        return KEY_HASH_ALGORITHMS[algorithm](movesBytes).digest()
+
+    @classmethod
+    def generateKeys(cls, movesList: list, algorithm: str = 'sha256') -> list:
+        """
+        generates the keys for many move strings in one call, the same keys ChessKeyGenerator(moves).generateKey()
+        gives for each, without building a generator object per string
+        :param movesList: list of move strings (str, or bytes already UTF-8 encoded)
+        :param algorithm: hash used for the keys, 'sha256' (default) or 'blake2b'
+        :return: list of 32 byte keys, in the same order as movesList
+        """
+        hashFunction = KEY_HASH_ALGORITHMS[algorithm]
+        return [hashFunction(moves.encode('utf-8') if isinstance(moves, str) else moves).digest()
+                for moves in movesList]
 
 
 class AESEncryptorAndDecryptor:
     """
-    does encryption and decryption using AES algorithms
+    does encryption and decryption using AES algorithms (or ChaCha20-Poly1305 if selected)
     """
-    def __init__(self, key: bytes):
+    # supported block cipher modes, CBC is the default and the format used by the generated images
+    MODES = {'cbc': modes.CBC, 'ctr': modes.CTR}
+    # authenticated modes, encryption and the integrity tag are computed in the same pass over the data, cipher text
+    # is 12 byte nonce || encrypted bytes || 16 byte tag
+    AEAD_MODES = {'gcm': AESGCM, 'chacha20': ChaCha20Poly1305}
+
+    def __init__(self, key: bytes, mode: str = 'cbc'):
         """
         constructor for AESEncryptorAndDecryptor, takes 32 bytes AES key and stores it in self.key
         :param key: 32 byte AES key to use
+        :param mode: 'cbc' (default), 'ctr', 'gcm' or 'chacha20'. CTR needs no padding and its blocks are independent,
+        so AES-NI can pipeline them. GCM adds an authentication tag so tampered cipher text is rejected,
+        ChaCha20-Poly1305 does the same and is the faster choice on CPUs without AES-NI. A nonce must never repeat
+        under the same key, every message gets fresh random bytes from getRandomBytes, which never hands the same bytes
+        out twice
         """
+        if mode not in self.MODES and mode not in self.AEAD_MODES:
+            raise ValueError(f"Unsupported AES mode: {mode}")
         self.key = key
+        self.mode = mode
+        if mode in self.AEAD_MODES:
+            self._aead = self.AEAD_MODES[mode](key)  # key checked and set up once for every message
+            self.nonceSize = 12
+        else:
+            self._aead = None
+            self._alg = algorithms.AES(key)  # key checked and wrapped once, shared by every cipher below
+            self._cipherMode = self.MODES[mode]
+            self.nonceSize = 16
 
-    def doPaddingHelper(self, inputString: str) -> str:
+    def doPaddingHelper(self, inputBytes: bytes) -> bytes:
         """
-        PKCS7 padding helper
-        :param inputString:input string to be converted to PKCS7 padding
+        PKCS7 padding helper, pads the already encoded bytes so the padding length is counted in bytes
+        :param inputBytes: encoded plaintext (bytes, bytearray or memoryview) to be converted to PKCS7 padding
         :return: PKCS7 padded bytes
-        "abc" → "abc\x0f\x0f...\x0f" (16-byte block).
+        b"abc" → b"abc\x0d\x0d...\x0d" (16-byte block).
         """
-        blockSizeForAES = 16
-        numberOfPaddingBytesNeeded = blockSizeForAES - len(inputString) % blockSizeForAES
-        return inputString + chr(numberOfPaddingBytesNeeded) * numberOfPaddingBytesNeeded
+        inputBytes = memoryview(inputBytes).cast('B')  # one item per byte, an array of wider items has fewer items
+        numberOfPaddingBytesNeeded = 16 - (len(inputBytes) & 15)  # & 15 is % 16 for the 16 byte AES block
+        # join copies the input straight into the padded result, whatever buffer type it is
+        return b"".join((inputBytes, PKCS7_PADDING[numberOfPaddingBytesNeeded - 1]))
 
+    def encryptWithIVHelper(self, plainTextBytes: bytes, initializationVector: bytes) -> bytes:
+        """
+        encrypts encoded plaintext with the given 16 byte initialization vector (the nonce in CTR mode, a 12 byte nonce
+        in the authenticated modes)
+        :param plainTextBytes: encoded plaintext
+        :param initializationVector: self.nonceSize fresh random bytes
+        :return: initialization vector followed by the cipher text (and the tag in the authenticated modes)
+        """
+        # a flat byte view, so len() below counts bytes and the cipher accepts arrays/memoryviews of wider items too
+        plainTextBytes = memoryview(plainTextBytes).cast('B')
+        if self._aead is not None:
+            return b"".join((initializationVector, self._aead.encrypt(initializationVector, plainTextBytes, None)))
+        cipherObject = Cipher(self._alg, self._cipherMode(initializationVector))
+        encryptorObject = cipherObject.encryptor()
+        if self.mode == 'cbc':
+            # the padding is fed as a second update instead of building a padded copy of the plaintext first, the
+            # encryptor buffers the partial last block itself
+            padding = PKCS7_PADDING[15 - (len(plainTextBytes) & 15)]
+            return b"".join((initializationVector, encryptorObject.update(plainTextBytes),
+                             encryptorObject.update(padding), encryptorObject.finalize()))
+        # one join builds iv || ciphertext without the intermediate concatenated copies
+        return b"".join((initializationVector, encryptorObject.update(plainTextBytes), encryptorObject.finalize()))
 
-    def encrypt(self, plainText: str) -> bytes:
+    def encrypt(self, plainText) -> bytes:
+        """
+        Encrypts plaintext using AES-CBC (cipher blockchain), or AES-CTR if selected in the constructor
+        :param plainText: bytes, bytearray or memoryview to encrypt, used as is without an intermediate copy
+        :return: encrypted bytes
         """
-        Encrypts plaintext using AES-CBC (cipher blockchain)
+        return self.encryptWithIVHelper(plainText, getRandomBytes(self.nonceSize))
+
+    def encryptStr(self, plainText: str) -> bytes:
+        """
+        Encrypts a string, encoded to UTF-8 once at the boundary
         :param plainText: string to encrypt
         :return: encrypted bytes
         """
-        paddedPlainText = self.doPaddingHelper(plainText)
-        paddedPlainTextToBytes = paddedPlainText.encode('utf-8')
-        initializationVector = os.urandom(16)
-        cipherObject = Cipher(algorithms.AES(self.key), modes.CBC(initializationVector), backend=default_backend())
-        encryptorObject = cipherObject.encryptor()
-        cipherText = encryptorObject.update(paddedPlainTextToBytes) + encryptorObject.finalize()
-        return initializationVector + cipherText
+        return self.encrypt(plainText.encode('utf-8'))
 
-    def removePadding(self, inputBytes: bytes) -> bytes:
+    def encryptMany(self, plainTexts: list, workers: int = None) -> list:
         """
-        Removes PKCS7 padding from decrypted binary data.
-        :param inputBytes: string to remove PKCS7 padding
-        :return: unpadded bytes
+        Encrypts several plaintexts with the same key, sharing the AES key object and drawing all initialization
+        vectors from the random pool in one request
+        :param plainTexts: list of bytes-like plaintexts to encrypt
+        :param workers: number of threads to spread the list over, None or 1 encrypts in the calling thread. OpenSSL
+        runs without the GIL, so threads pay off for batches of large messages, for short ones the per-call overhead
+        dominates and one thread is faster
+        :return: list of encrypted bytes, one per plaintext, each in the same format as encrypt()
         """
-        paddingLength = inputBytes[-1]
-        return inputBytes[:-paddingLength]
+        if workers is not None and workers > 1 and len(plainTexts) > 1:
+            # one contiguous slice per thread keeps the output order and gives every thread its own cipher contexts
+            chunkSize = -(-len(plainTexts) // workers)  # ceiling division
+            chunks = [plainTexts[start: start + chunkSize] for start in range(0, len(plainTexts), chunkSize)]
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                return [cipherText for chunk in executor.map(self.encryptMany, chunks) for cipherText in chunk]
 
+        nonceSize = self.nonceSize
+        initializationVectors = getRandomBytes(nonceSize * len(plainTexts))
+        if self.mode == 'ctr' and plainTexts:
+            encryptorObject = Cipher(self._alg, modes.CTR(initializationVectors[:16])).encryptor()
+            if hasattr(encryptorObject, 'reset_nonce'):  # cryptography >= 43
+                # setting up an OpenSSL context costs far more than encrypting a short message, so one context is
+                # kept for the whole batch and only its nonce is swapped per message (CTR never needs finalize)
+                resetNonce, update, join = encryptorObject.reset_nonce, encryptorObject.update, b"".join
+                cipherTexts = []
+                for index, plainText in enumerate(plainTexts):
+                    initializationVector = initializationVectors[16 * index: 16 * (index + 1)]
+                    resetNonce(initializationVector)
+                    cipherTexts.append(join((initializationVector, update(memoryview(plainText).cast('B')))))
+                return cipherTexts
 
-    def decrypt(self, cipherText: bytes) -> bytes:
+        encryptWithIV = self.encryptWithIVHelper  # bound once instead of looked up for every message
+        return [encryptWithIV(plainText, initializationVectors[nonceSize * index: nonceSize * (index + 1)])
+                for index, plainText in enumerate(plainTexts)]
+
+    def removePadding(self, inputBytes: bytes) -> memoryview:
         """
-        decrypts cipher text using AES-CBC (cipher blockchain)
+        Removes PKCS7 padding from decrypted binary data, checking that it is valid PKCS7 instead of slicing off
+        whatever the last byte says, and returns a view into inputBytes, so nothing is copied. The padding bytes are
+        compared with hmac.compare_digest, but the length checks before it branch on the padding byte, so the check
+        as a whole is not constant time
+        :param inputBytes: decrypted bytes to remove PKCS7 padding from
+        :return: memoryview of the unpadded bytes
+        :raises ValueError: if the padding is not valid PKCS7 (usually a wrong key or a damaged image)
+        """
+        paddingLength = inputBytes[-1] if inputBytes else 0
+        if not 1 <= paddingLength <= 16 or paddingLength > len(inputBytes):
+            raise ValueError("Invalid padding")
+        view = memoryview(inputBytes)
+        if not hmac.compare_digest(view[-paddingLength:], PKCS7_PADDING[paddingLength - 1]):
+            raise ValueError("Invalid padding")
+        return view[:-paddingLength]
+
+    def decryptView(self, cipherText: bytes) -> memoryview:
+        """
+        decrypts cipher text like decrypt, but returns a memoryview of the plaintext instead of copying it into a new
+        bytes object, for callers that only read or decode the result
         :param cipherText: cipher text in bytes to be decrypted
-        :return:  plaintext string
+        :return: memoryview of the plaintext bytes
+        :raises ValueError: if the padding or, in the authenticated modes, the tag does not check out
         """
+        if self._aead is not None:
+            nonce = cipherText[:12]
+            try:
+                return memoryview(self._aead.decrypt(nonce, memoryview(cipherText)[12:], None))
+            except InvalidTag:
+                raise ValueError("Authentication failed, wrong key or modified cipher text") from None
+
         initializationVector = cipherText[:16]
-        actualCipherText = cipherText[16:]
-        cipherObject = Cipher(algorithms.AES(self.key), modes.CBC(initializationVector), backend=default_backend())
+        actualCipherText = memoryview(cipherText)[16:]  # view, the ciphertext body is not copied before decrypting
+        cipherObject = Cipher(self._alg, self._cipherMode(initializationVector))
         decryptorObject = cipherObject.decryptor()
-        paddedPlainText = decryptorObject.update(actualCipherText) + decryptorObject.finalize()
-        return self.removePadding(paddedPlainText).decode('utf-8')
-# ============================================================CLASSES===================================================
\ No newline at end of file
+        plainTextBytes = decryptorObject.update(actualCipherText)
+        finalBytes = decryptorObject.finalize()  # empty for CBC and CTR, joined only if a backend ever returns data
+        if finalBytes:
+            plainTextBytes += finalBytes
+        if self.mode == 'cbc':
+            return self.removePadding(plainTextBytes)
+        return memoryview(plainTextBytes)
+
+    def decrypt(self, cipherText: bytes) -> bytes:
+        """
+        decrypts cipher text using AES-CBC (cipher blockchain), or AES-CTR if selected in the constructor
+        :param cipherText: cipher text in bytes to be decrypted
+        :return: plaintext bytes
+        """
+        return bytes(self.decryptView(cipherText))
+
+    def decryptStr(self, cipherText: bytes) -> str:
+        """
+        decrypts cipher text produced by encryptStr back to the original string
+        :param cipherText: cipher text in bytes to be decrypted
+        :return: plaintext string
+        """
+        return str(self.decryptView(cipherText), 'utf-8')  # decoded straight from the view, no bytes copy in between
+# ============================================================CLASSES===================================================
+
+
+# ==========================================================FUNCTIONS===================================================
+def encryptWithMoves(moves, plainText) -> bytes:
+    """
+    derives the key from the chess moves and encrypts in one call, the same result as
+    AESEncryptorAndDecryptor(ChessKeyGenerator(moves).generateKey()).encrypt(...) without the key generator object
+    :param moves: chess moves as string (or already UTF-8 encoded bytes)
+    :param plainText: string (encoded to UTF-8) or bytes-like plaintext
+    :return: encrypted bytes (initialization vector followed by the AES-CBC cipher text)
+    """
+    if isinstance(moves, str):
+        moves = moves.encode('utf-8')
+    if isinstance(plainText, str):
+        plainText = plainText.encode('utf-8')
+    return AESEncryptorAndDecryptor(ChessKeyGenerator.generateKeyFromBytes(moves)).encrypt(plainText)
+
+
+def decryptWithMoves(moves, cipherText: bytes) -> bytes:
+    """
+    derives the key from the chess moves and decrypts cipher text made by encryptWithMoves (or encrypt/encryptStr)
+    :param moves: chess moves as string (or already UTF-8 encoded bytes)
+    :param cipherText: cipher text in bytes to be decrypted
+    :return: plaintext bytes, call .decode('utf-8') if a string was encrypted
+    """
+    if isinstance(moves, str):
+        moves = moves.encode('utf-8')
+    return AESEncryptorAndDecryptor(ChessKeyGenerator.generateKeyFromBytes(moves)).decrypt(cipherText)
+# ==========================================================FUNCTIONS===================================================
\ No newline at end of file
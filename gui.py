@@ -1,18 +1,65 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 import os
+import re
 import sys
 import threading
 import subprocess
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 
 import chess
-import pyperclip
-from PIL import Image, ImageTk
 
-# Import the project modules
-from encryption import ChessKeyGenerator, AESEncryptorAndDecryptor
-from steganography import Steganography
-from utils import generateBoardImage, getGamePositions
+# PIL and the project modules (encryption, steganography, utils) are imported where they are first used,
+# so the window can show before they load
+
+
+@lru_cache(maxsize=32)
+def cipher_for_moves(moves: str):
+    """Return the AES encryptor/decryptor keyed by the given chess moves, reused while the moves stay the same"""
+    from encryption import ChessKeyGenerator, AESEncryptorAndDecryptor
+    return AESEncryptorAndDecryptor(ChessKeyGenerator(moves).generateKey())
+
+
+@lru_cache(maxsize=16)
+def board_image_for_fen(fen: str):
+    """Render the board for a position once, repeated encrypts of the same game reuse the image (do not modify it)"""
+    from utils import generateBoardImage
+    return generateBoardImage(fen)
+
+
+@lru_cache(maxsize=32)
+def positions_for_moves(moves: str) -> tuple:
+    """getGamePositions, parsed once per moves string (validation and repeated encrypts reuse the result).
+    Only the piece placements, all that board rendering and the move count need"""
+    from utils import getGamePositions
+    return tuple(getGamePositions(moves, full=False))
+
+
+@contextmanager
+def editable(text_widget):
+    """Make a read-only text widget writable for the block, it is made read-only again even if the block fails"""
+    text_widget.config(state=tk.NORMAL)
+    try:
+        yield text_widget
+    finally:
+        text_widget.config(state=tk.DISABLED)
+
+
+MOVE_NUMBER = re.compile(r'\d+\.+')  # "12." or "12..." tokens, skipped by the PGN parser
+
+
+def first_moves_positions(move_list: list, count: int, all_positions: tuple) -> tuple:
+    """
+    Positions after the first count tokens of move_list. When every move token of the game parsed, these are a prefix
+    of all_positions and are sliced out of it instead of parsing the moves again
+    """
+    plies = [token for token in move_list if not MOVE_NUMBER.fullmatch(token)]
+    if len(plies) == len(all_positions):
+        return all_positions[:sum(1 for token in move_list[:count] if not MOVE_NUMBER.fullmatch(token))]
+    return positions_for_moves(" ".join(move_list[:count]))
 
 
 class CBESSApplication(tk.Tk):
@@ -48,6 +95,9 @@ class CBESSApplication(tk.Tk):
         self.last_encrypted_text = None
         self.encryption_moves = None
         self.key_moves = None
+        self._steganographer = None  # created on first use, see the steganographer property
+        self._preview_cache = {}  # image path -> ((mtime, size), resized preview), see _load_preview
+        self._embed_scratch = [None, None]  # pixel buffers for the cipher and key embeds, see _embed_scratch_for
         self.board = chess.Board()  # create chess board here
 
         # Create main container
@@ -74,6 +124,17 @@ class CBESSApplication(tk.Tk):
         self.status_bar = ttk.Label(self, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+        # Progress of the running encryption/decryption, set at fixed steps (0/25/50/75/100)
+        self.progress_var = tk.IntVar(value=0)
+        self.progress_bar = ttk.Progressbar(self, variable=self.progress_var, maximum=100, mode='determinate')
+        self.progress_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Encryption and decryption run on a worker thread, widget updates are queued back to the Tk thread
+        self._worker = None
+        self._ui_queue = queue.Queue()
+        self._chess_process = None
+        self.after(50, self._drain_ui_queue)
+
     def _build_encrypt_tab(self):
         # Main layout frames
         left_frame = ttk.Frame(self.encrypt_tab)
@@ -168,6 +229,11 @@ class CBESSApplication(tk.Tk):
                                                       state=tk.DISABLED)
         self.details_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        # details text waiting to be written, see update_details_text / append_details_text
+        self._details_buffer = []
+        self._details_replace = False
+        self._details_flush_scheduled = False
+
     def _build_decrypt_tab(self):
         # Main layout frames
         left_frame = ttk.Frame(self.decrypt_tab)
@@ -287,33 +353,86 @@ class CBESSApplication(tk.Tk):
     def launch_chess_game(self):
         """Launch the chess game in a separate process"""
         self.status_var.set("Launching chess game...")
-
-        # Run in a separate thread to avoid UI freeze
-        def run_chess():
+        try:
+            # Get the path to chessgui.py
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            chess_path = os.path.join(script_dir, "chessgui.py")
+
+            # Start the chess game, Popen returns right away so no thread is needed to keep the UI responsive
+            self._chess_process = subprocess.Popen([sys.executable, chess_path])
+            self.status_var.set("Chess game launched. Copy moves when done.")
+            self.after(500, self._poll_chess_game, self._chess_process)
+        except Exception as e:
+            self.status_var.set(f"Error launching chess game: {str(e)}")
+            messagebox.showerror("Error", f"Failed to launch chess game: {str(e)}")
+
+    def _poll_chess_game(self, process):
+        """Check every 500ms whether the chess game process has exited"""
+        if process.poll() is None:
+            self.after(500, self._poll_chess_game, process)
+        elif process is self._chess_process:  # a newer game may have been launched meanwhile
+            self.status_var.set("Chess game closed.")
+
+    @property
+    def steganographer(self):
+        """The Steganography helper, stateless, so one instance serves every embed and extract"""
+        if self._steganographer is None:
+            from steganography import Steganography
+            self._steganographer = Steganography()
+        return self._steganographer
+
+    def _embed_scratch_for(self, board, slot):
+        """uint8 pixel buffer for Steganography.embed, one per slot (the cipher and key embeds run concurrently),
+        reused while the board size stays the same"""
+        import numpy as np
+        shape = (board.height, board.width, 3)
+        if self._embed_scratch[slot] is None or self._embed_scratch[slot].shape != shape:
+            self._embed_scratch[slot] = np.empty(shape, dtype=np.uint8)
+        return self._embed_scratch[slot]
+
+    def _render_and_embed(self, position, payload, image_path, slot):
+        """Render the board for a position, embed the payload and save it, then load its preview"""
+        board = board_image_for_fen(position)
+        # embedded straight from the rendered board (no write and re-read)
+        self.steganographer.embed(board, payload, image_path, scratch=self._embed_scratch_for(board, slot))
+        # a rewrite within the file system's timestamp resolution can keep the same mtime and size, so the preview
+        # of a file written here is never taken from the cache
+        self._preview_cache.pop(os.path.abspath(image_path), None)
+        return self._load_preview(image_path)
+
+    def run_on_ui(self, func, *args):
+        """Queue a call for the Tk thread, Tk widgets must not be touched from worker threads"""
+        self._ui_queue.put((func, args))
+
+    def _drain_ui_queue(self):
+        """Run the calls queued by worker threads, reschedules itself every 50ms"""
+        self.after(50, self._drain_ui_queue)  # scheduled first so a failing call can not stop the polling
+        ran_any = False
+        while True:
             try:
-                # Get the path to chessgui.py
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                chess_path = os.path.join(script_dir, "chessgui.py")
-
-                # Start the chess game
-                process = subprocess.Popen([sys.executable, chess_path])
-                self.status_var.set("Chess game launched. Copy moves when done.")
-
-                # Wait for the process to finish
-                process.wait()
-                self.status_var.set("Chess game closed.")
-            except Exception as e:
-                self.status_var.set(f"Error launching chess game: {str(e)}")
-                messagebox.showerror("Error", f"Failed to launch chess game: {str(e)}")
-
-        thread = threading.Thread(target=run_chess)
-        thread.daemon = True
-        thread.start()
+                func, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+            ran_any = True
+        if ran_any:
+            self.update_idletasks()  # one redraw for the whole batch instead of one per update
+
+    def _start_worker(self, target, *args):
+        """Run target(*args) on a worker thread so the window stays responsive, one job at a time"""
+        if self._worker is not None and self._worker.is_alive():
+            self.status_var.set("Please wait, the previous operation is still running...")
+            return
+        self._worker = threading.Thread(target=target, args=args, daemon=True)
+        self._worker.start()
 
     def paste_chess_moves(self):
         """Paste clipboard content to chess moves text area"""
         try:
-            clipboard_content = pyperclip.paste()
+            try:
+                clipboard_content = self.clipboard_get()  # Tk's own clipboard, no helper process
+            except tk.TclError:  # raised when the clipboard is empty or holds no text
+                clipboard_content = ""
             if clipboard_content:
                 self.moves_text.delete(1.0, tk.END)
                 self.moves_text.insert(tk.INSERT, clipboard_content)
@@ -325,22 +444,26 @@ class CBESSApplication(tk.Tk):
 
     def encrypt_and_embed(self):
         """Combined method to encrypt and embed in one step"""
-        try:
-            # Get input values
-            plaintext = self.plaintext_text.get(1.0, tk.END).strip()
-            moves = self.moves_text.get(1.0, tk.END).strip()
-            cipher_path = self.cipher_image_path.get()
-            key_path = self.key_image_path.get()
+        # Get input values (widgets are read here, on the Tk thread)
+        plaintext = self.plaintext_text.get(1.0, tk.END).strip()
+        moves = self.moves_text.get(1.0, tk.END).strip()
+        cipher_path = self.cipher_image_path.get()
+        key_path = self.key_image_path.get()
+
+        # Validate inputs
+        if not moves:
+            messagebox.showerror("Error", "Please enter chess moves or play a game first.")
+            return
 
-            # Validate inputs
-            if not moves:
-                messagebox.showerror("Error", "Please enter chess moves or play a game first.")
-                return
+        if not plaintext:
+            messagebox.showerror("Error", "Please enter a message to encrypt.")
+            return
 
-            if not plaintext:
-                messagebox.showerror("Error", "Please enter a message to encrypt.")
-                return
+        self._start_worker(self._encrypt_and_embed_worker, plaintext, moves, cipher_path, key_path)
 
+    def _encrypt_and_embed_worker(self, plaintext, moves, cipher_path, key_path):
+        """Encrypts and embeds on a worker thread, every widget update goes through run_on_ui"""
+        try:
             # Split moves into two halves, but in summer we can change this to something more random
             # or based on user input for more security !!!
             move_list = moves.split()
@@ -350,151 +473,167 @@ class CBESSApplication(tk.Tk):
             encryption_moves = " ".join(move_list[:midpoint])
             # all the moves is for key embedding
             key_moves = moves  # Use all moves for key embedding
+            key_moves_bytes = key_moves.encode('utf-8')  # encoded once, before any image is written
 
             # Store for later reference
             self.encryption_moves = encryption_moves
             self.key_moves = key_moves
 
             # Update details display
-            self.update_details_text(
-                f"Chess moves split:\n- First half for encryption: {encryption_moves}\n- Full moves for key: {key_moves}")
+            self.run_on_ui(self.update_details_text,
+                           f"Chess moves split:\n- First half for encryption: {encryption_moves}"
+                           f"\n- Full moves for key: {key_moves}")
 
             # 1. Generate key from first half of chess moves
-            self.status_var.set("Generating key from first half of chess moves...")
-            key_generator = ChessKeyGenerator(encryption_moves)
-            key = key_generator.generateKey()
+            self.run_on_ui(self.status_var.set, "Encrypting and embedding message...")
+            self.run_on_ui(self.progress_var.set, 0)
+            encryptor = cipher_for_moves(encryption_moves)
 
             # 2. Encrypt the message
-            self.status_var.set("Encrypting message...")
-            encryptor = AESEncryptorAndDecryptor(key)
-            cipherText = encryptor.encrypt(plaintext)
+            cipherText = encryptor.encryptStr(plaintext)
             self.last_encrypted_text = cipherText
-
-            # 3. Generate and save cipher board image
-            self.status_var.set("Generating cipher board image...")
-            cipher_positions = getGamePositions(encryption_moves)
-            if cipher_positions:
-                last_cipher_position = cipher_positions[-1]
-                generateBoardImage(last_cipher_position, cipher_path)
-
-                # 4. Embed ciphertext in cipher image
-                self.status_var.set("Embedding ciphertext in cipher image...")
-                steganographer = Steganography()
-                steganographer.embed(cipher_path, cipherText, cipher_path)
-
-                # Update preview
-                self.update_image_preview(cipher_path, self.cipher_preview_label)
-
-            # 5. Generate and save key board image
-            self.status_var.set("Generating key board image...")
-            key_positions = getGamePositions(key_moves)
-            if key_positions:
-                last_key_position = key_positions[-1]
-                generateBoardImage(last_key_position, key_path)
-
-                # 6. Embed key source in key image
-                self.status_var.set("Embedding key source in key image...")
-                steganographer = Steganography()
-                steganographer.embed(key_path, key_moves.encode('utf-8'), key_path)
-
-                # Update preview
-                self.update_image_preview(key_path, self.key_preview_label)
-
-            self.status_var.set("Message encrypted and embedded successfully.")
-            messagebox.showinfo("Success",
-                                "Message encrypted and embedded successfully!\n\n"
-                                "Key image contains all chess moves.\n"
-                                "Cipher image contains the encrypted message.\n\n"
-                                "Both images are needed for decryption.")
+            self.run_on_ui(self.progress_var.set, 25)
+
+            # 3. Generate and save cipher board image, the whole game is parsed once for both boards
+            key_positions = positions_for_moves(key_moves)
+            cipher_positions = first_moves_positions(move_list, midpoint, key_positions)
+
+            # 4-6. The cipher and key boards are independent, so they are rendered, embedded and saved in parallel
+            # (PNG encoding, numpy and file I/O release the GIL). The same output path is written one after the other
+            same_path = os.path.abspath(cipher_path) == os.path.abspath(key_path)
+            with ThreadPoolExecutor(max_workers=1 if same_path else 2) as executor:
+                cipher_job = key_job = None
+                if cipher_positions:
+                    cipher_job = executor.submit(self._render_and_embed, cipher_positions[-1], cipherText,
+                                                 cipher_path, 0)
+                if key_positions:
+                    key_job = executor.submit(self._render_and_embed, key_positions[-1], key_moves_bytes, key_path, 1)
+
+                # Update previews (resized on the pool, shown on the Tk thread)
+                if cipher_job is not None:
+                    self.run_on_ui(self._show_preview, self.cipher_preview_label, *cipher_job.result())
+                self.run_on_ui(self.progress_var.set, 50)
+                if key_job is not None:
+                    self.run_on_ui(self._show_preview, self.key_preview_label, *key_job.result())
+                self.run_on_ui(self.progress_var.set, 75)
+
+            self.run_on_ui(self.progress_var.set, 100)
+            self.run_on_ui(self.status_var.set, "Message encrypted and embedded successfully.")
+            self.run_on_ui(messagebox.showinfo, "Success",
+                           "Message encrypted and embedded successfully!\n\n"
+                           "Key image contains all chess moves.\n"
+                           "Cipher image contains the encrypted message.\n\n"
+                           "Both images are needed for decryption.")
 
             # Update details with final info
-            self.append_details_text("\nProcess completed successfully:"
-                                     f"\n- Cipher image saved to: {cipher_path}"
-                                     f"\n- Key image saved to: {key_path}")
+            self.run_on_ui(self.append_details_text, "\nProcess completed successfully:"
+                                                     f"\n- Cipher image saved to: {cipher_path}"
+                                                     f"\n- Key image saved to: {key_path}")
 
         except Exception as e:
-            self.status_var.set(f"Error: {str(e)}")
-            messagebox.showerror("Error", str(e))
+            self.run_on_ui(self.progress_var.set, 0)
+            self.run_on_ui(self.status_var.set, f"Error: {str(e)}")
+            self.run_on_ui(messagebox.showerror, "Error", str(e))
 
     def update_details_text(self, text):
         """Update the details text widget with new content"""
-        self.details_text.config(state=tk.NORMAL)
-        self.details_text.delete(1.0, tk.END)
-        self.details_text.insert(tk.INSERT, text)
-        self.details_text.config(state=tk.DISABLED)
-        self.update()  # Force UI update
+        self._details_replace = True
+        self._details_buffer = [text]
+        self._schedule_details_flush()
 
     def append_details_text(self, text):
         """Append text to the details text widget"""
-        self.details_text.config(state=tk.NORMAL)
-        self.details_text.insert(tk.END, text)
-        self.details_text.config(state=tk.DISABLED)
-        self.update()  # Force UI update
+        self._details_buffer.append(text)
+        self._schedule_details_flush()
+
+    def _schedule_details_flush(self):
+        """Write the buffered details text at most every 100ms, so the widget re-wraps once per batch"""
+        if not self._details_flush_scheduled:
+            self._details_flush_scheduled = True
+            self.after(100, self._flush_details_text)
+
+    def _flush_details_text(self):
+        """Write the buffered details text into the widget in a single insert"""
+        self._details_flush_scheduled = False
+        if not self._details_replace and not self._details_buffer:
+            return
+        with editable(self.details_text):
+            if self._details_replace:
+                self.details_text.delete(1.0, tk.END)
+            self.details_text.insert(tk.END, "".join(self._details_buffer))
+        self._details_replace = False
+        self._details_buffer = []
+
+    def _set_readonly_text(self, text_widget, text):
+        """Replace the content of a read-only text widget"""
+        with editable(text_widget):
+            text_widget.delete(1.0, tk.END)
+            text_widget.insert(tk.INSERT, text)
 
     def decrypt_message(self):
         """Extract data and decrypt the message"""
-        try:
-            cipher_path = self.decrypt_cipher_path.get()
-            key_path = self.decrypt_key_path.get()
+        cipher_path = self.decrypt_cipher_path.get()
+        key_path = self.decrypt_key_path.get()
 
-            if not cipher_path or not os.path.exists(cipher_path):
-                messagebox.showerror("Error", "Please select a valid cipher image file.")
-                return
+        if not cipher_path or not os.path.exists(cipher_path):
+            messagebox.showerror("Error", "Please select a valid cipher image file.")
+            return
 
-            if not key_path or not os.path.exists(key_path):
-                messagebox.showerror("Error", "Please select a valid key image file.")
-                return
+        if not key_path or not os.path.exists(key_path):
+            messagebox.showerror("Error", "Please select a valid key image file.")
+            return
 
+        self._start_worker(self._decrypt_message_worker, cipher_path, key_path)
+
+    def _decrypt_message_worker(self, cipher_path, key_path):
+        """Extracts and decrypts on a worker thread, every widget update goes through run_on_ui"""
+        try:
             # 1. Extract the chess moves (key source)
-            self.status_var.set("Extracting key source from key image...")
-            steganographer = Steganography()
-            extracted_data = steganographer.extract(key_path)
+            self.run_on_ui(self.status_var.set, "Extracting and decrypting message...")
+            self.run_on_ui(self.progress_var.set, 0)
+            extracted_data = self.steganographer.extract(key_path)
             extracted_moves = extracted_data.decode('utf-8')
 
             # Display the extracted moves
-            self.extracted_key_text.config(state=tk.NORMAL)
-            self.extracted_key_text.delete(1.0, tk.END)
-            self.extracted_key_text.insert(tk.INSERT, extracted_moves)
-            self.extracted_key_text.config(state=tk.DISABLED)
+            self.run_on_ui(self._set_readonly_text, self.extracted_key_text, extracted_moves)
 
             # For decryption, use first half of extracted moves
             move_list = extracted_moves.split()
             midpoint = len(move_list) // 2
             decryption_moves = " ".join(move_list[:midpoint])
 
+            self.run_on_ui(self.progress_var.set, 25)
+
             # 2. Extract the ciphertext
-            self.status_var.set("Extracting ciphertext from cipher image...")
-            ciphertext = steganographer.extract(cipher_path)
+            ciphertext = self.steganographer.extract(cipher_path)
+            self.run_on_ui(self.progress_var.set, 50)
 
             # 3. Generate key from first half of chess moves
-            self.status_var.set("Generating key from first half of chess moves...")
-            key_generator = ChessKeyGenerator(decryption_moves)
-            key = key_generator.generateKey()
+            encryptor = cipher_for_moves(decryption_moves)
+            self.run_on_ui(self.progress_var.set, 75)
 
             # 4. Decrypt the message
-            self.status_var.set("Decrypting message...")
-            encryptor = AESEncryptorAndDecryptor(key)
-            plaintext = encryptor.decrypt(ciphertext)
+            plaintext = encryptor.decryptStr(ciphertext)
 
             # Display the decrypted message
-            self.decrypted_text.config(state=tk.NORMAL)
-            self.decrypted_text.delete(1.0, tk.END)
-            self.decrypted_text.insert(tk.INSERT, plaintext)
-            self.decrypted_text.config(state=tk.DISABLED)
+            self.run_on_ui(self._set_readonly_text, self.decrypted_text, plaintext)
 
-            self.status_var.set("Message decrypted successfully.")
-            messagebox.showinfo("Success", "Message decrypted successfully!")
+            self.run_on_ui(self.progress_var.set, 100)
+            self.run_on_ui(self.status_var.set, "Message decrypted successfully.")
+            self.run_on_ui(messagebox.showinfo, "Success", "Message decrypted successfully!")
 
         except Exception as e:
-            self.status_var.set(f"Decryption error: {str(e)}")
-            messagebox.showerror("Decryption Error", str(e))
+            self.run_on_ui(self.progress_var.set, 0)
+            self.run_on_ui(self.status_var.set, f"Decryption error: {str(e)}")
+            self.run_on_ui(messagebox.showerror, "Decryption Error", str(e))
 
     def copy_decrypted_message(self):
         """Copy decrypted message to clipboard"""
         try:
             message = self.decrypted_text.get(1.0, tk.END).strip()
             if message:
-                pyperclip.copy(message)
+                self.clipboard_clear()
+                self.clipboard_append(message)
                 self.status_var.set("Decrypted message copied to clipboard.")
                 messagebox.showinfo("Copied", "Decrypted message copied to clipboard.")
             else:
@@ -504,39 +643,82 @@ class CBESSApplication(tk.Tk):
 
     def update_image_preview(self, image_path, label_widget):
         """Update the image preview in the given label widget"""
+        self._show_preview(label_widget, *self._load_preview(image_path))
+
+    def _load_preview(self, image_path):
+        """Load and resize an image for the preview, safe to call off the Tk thread. Returns (image, message)"""
         try:
-            if os.path.exists(image_path):
-                # Load and resize the image
-                img = Image.open(image_path)
-                max_size = 250
-                ratio = min(max_size / img.width, max_size / img.height)
-                new_size = (int(img.width * ratio), int(img.height * ratio))
-                img = img.resize(new_size, Image.LANCZOS)
-
-                # Convert to PhotoImage
-                photo = ImageTk.PhotoImage(img)
-
-                # Update label
-                label_widget.config(
-                    image=photo,
-                    text="",
-                    compound=tk.CENTER
-                )
-                label_widget.image = photo
+            if not os.path.exists(image_path):
+                return None, "Image not found"
+
+            # an unchanged file (same modification time and size) reuses the preview made last time
+            file_stat = os.stat(image_path)
+            file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+            cache_key = os.path.abspath(image_path)  # the same file however its path was written
+            cached = self._preview_cache.get(cache_key)
+            if cached is not None and cached[0] == file_version:
+                return cached[1], ""
+
+            from PIL import Image
+            # Pillow >= 9.1 groups the resampling filters in Image.Resampling, older releases (and Pillow-SIMD) only
+            # have Image.*
+            resampling = getattr(Image, 'Resampling', Image)
+
+            # Load and resize the image
+            img = Image.open(image_path)
+            max_size = 250
+            longest_side = max(img.width, img.height)
+            factor = longest_side // max_size
+            if factor > 1 and longest_side == factor * max_size:
+                # exact integer downscale, a box average of factor x factor blocks with no filter kernel
+                preview = img.reduce(factor)
+            elif longest_side > max_size:
+                # resized in place, keeps the aspect ratio and lets JPEG files decode at reduced scale first,
+                # bilinear is plenty for a 250px preview
+                img.thumbnail((max_size, max_size), resampling.BILINEAR)
+                preview = img
             else:
-                label_widget.config(
-                    image="",  # Clear the image
-                    text="Image not found",
-                    compound=tk.CENTER
-                )
+                ratio = max_size / longest_side  # small images are scaled up to the preview size
+                new_size = (int(img.width * ratio), int(img.height * ratio))
+                preview = img.resize(new_size, resampling.BILINEAR)
+
+            self._preview_cache[cache_key] = (file_version, preview)
+            return preview, ""
         except Exception as e:
-            label_widget.config(text=f"Error loading image: {str(e)}")
+            return None, f"Error loading image: {str(e)}"
+
+    def _show_preview(self, label_widget, img, message):
+        """Show an image loaded by _load_preview (or its error message) in the label widget"""
+        if img is None:
+            label_widget.config(
+                image="",  # Clear the image
+                text=message,
+                compound=tk.CENTER
+            )
+            label_widget.preview_source = None
+            return
+
+        if getattr(label_widget, 'preview_source', None) is img:
+            return  # already showing this exact preview, no new PhotoImage needed
+
+        # Convert to PhotoImage
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(img)
+
+        # Update label
+        label_widget.config(
+            image=photo,
+            text="",
+            compound=tk.CENTER
+        )
+        label_widget.image = photo
+        label_widget.preview_source = img
 
     def _validate_moves(self, moves: str) -> bool:
         """Validate if chess moves are in algebraic notation."""
         try:
             # Use utils.get_game_positions to check if moves are valid
-            positions = getGamePositions(moves)
+            positions = positions_for_moves(moves)
             # Valid moves will have more than 1 FEN position (starting + at least 1 move)
             return len(positions) > 1
         except:
@@ -2,12 +2,18 @@
 import re
 from encryption import ChessKeyGenerator, AESEncryptorAndDecryptor
 from steganography import Steganography
-from utils import generateBoardImage, getGamePositions
+from utils import generateBoardImages, getGamePositions
 # ======================================================================================================================
 
 # Global variable to hold plaintext
 plaintext_global = ""
 
+# move numbers like "1. " or "12." in a pasted move list, compiled once
+MOVE_NUMBER_PATTERN = re.compile(r'\d+\.\s*')
+
+# the steganography helper keeps no state, so one instance is shared by embedding and extracting
+stego = Steganography()
+
 
 def parseMoveList(moves: str) -> str:
     """
@@ -15,8 +21,7 @@ def parseMoveList(moves: str) -> str:
     :param moves: string to parse
     :return: parsed moves
     """
-    parsed = re.sub(r'\d+\.\s*', '', moves)
-    return parsed.strip()
+    return MOVE_NUMBER_PATTERN.sub('', moves).strip()
 
 
 def inputMoveList() -> str:
@@ -62,7 +67,7 @@ def encryptAndEmbed():
     parsedMoves = parseMoveList(fullMoveList)
     print(f"\nParsed key source: {parsedMoves}\n")
 
-    positions = getGamePositions(parsedMoves)
+    positions = getGamePositions(parsedMoves, full=False)  # only drawn, so the piece placement is enough
     if not positions:
         print("Error: No valid positions generated!")
         return
@@ -78,17 +83,15 @@ def encryptAndEmbed():
     print(midGameMoves)
     print()
 
-    generateBoardImage(positions[midGameIdx], "cipher_board.png")
-    generateBoardImage(positions[-1], "key_board.png")
+    generateBoardImages([positions[midGameIdx], positions[-1]], ["cipher_board.png", "key_board.png"])
 
     keyGen = ChessKeyGenerator(parsedMoves)
     aesKey = keyGen.generateKey()
     encryptor = AESEncryptorAndDecryptor(aesKey)
-    cipherText = encryptor.encrypt(plaintext)
+    cipherText = encryptor.encryptStr(plaintext)
 
-    stego = Steganography()
     stego.embed("cipher_board.png", cipherText, "cipher_board.png")
-    stego.embed("key_board.png", parsedMoves.encode('utf-8'), "key_board.png")
+    stego.embed("key_board.png", keyGen.movesBytes, "key_board.png")
 
     print("\nEncryption complete!")
     print("- Ciphertext embedded in cipher_board.png")
@@ -100,7 +103,6 @@ def extractAndDecrypt():
     extracts and decrypts data from key and cipher image
     """
     print("\n--- Decryption Process ---")
-    stego = Steganography()
 
     try:
         extractedKeySource = stego.extract("key_board.png").decode('utf-8')
@@ -114,7 +116,7 @@ def extractAndDecrypt():
         #print(f"Extracted ciphertext: {extractedCipherText.hex()}")
 
         decryptor = AESEncryptorAndDecryptor(aesKey)
-        decryptedText = decryptor.decrypt(extractedCipherText)
+        decryptedText = decryptor.decryptStr(extractedCipherText)
         print(f"Decrypted plaintext: '{decryptedText}'")
 
         global plaintext_global
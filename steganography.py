@@ -7,43 +7,72 @@ class Steganography:
     """
     class for embedding and extracting to and from images
     """
+    # zlib level for the saved PNG, the board images barely shrink past level 1 but take noticeably longer to write
+    PNG_COMPRESS_LEVEL = 1
+    # payload bytes unpacked per step in embed, 1 MiB of bits, small enough to stay in cache
+    EMBED_CHUNK_BYTES = 128 * 1024
+
     def bytesToBinaryHelper(self, data: bytes) -> str:
         """
         converts bytes to binary string with 32 bit length header
         :param data: bytes of data to be converted to binary string
         """
-        dataLen = len(data)
-        binaryLen = format(dataLen, '032b')
-        binaryData = ''.join(format(byte, '08b') for byte in data)
-        return binaryLen + binaryData
+        bits = self.bytesToBitsHelper(data)
+        bits += ord('0')  # 0s and 1s into '0' and '1' characters, all in one pass instead of a format() per byte
+        return bits.tobytes().decode('ascii')
 
+    def bytesToBitsHelper(self, data: bytes) -> np.ndarray:
+        """
+        numpy counterpart of bytesToBinaryHelper, same bits (32 bit big-endian length header, then the data, most
+        significant bit first) as a uint8 array of 0s and 1s instead of a '0'/'1' string
+        :param data: bytes of data to be converted to bits
+        :return: uint8 array with one element per bit
+        """
+        header = np.array([len(data)], dtype='>u4').view(np.uint8)
+        return np.concatenate((np.unpackbits(header), np.unpackbits(np.frombuffer(data, dtype=np.uint8))))
 
-    def embed(self, inputImagePath: str, data: bytes, outputImagePath: str):
+    def embed(self, inputImagePath, data: bytes, outputImagePath: str, scratch: np.ndarray = None):
         """
         embeds the given data into the least significant bits (LSBs) of the pixel values of the input image by
         modifying the least significant bits of each color channel (Red, Green, Blue) in each pixel.
-        :param inputImagePath: path to the image to be embedded
+        :param inputImagePath: path to the image to be embedded, or an already loaded PIL image (left unchanged)
         :param data: data to be hidden in the image
         :param outputImagePath: path to the output image
+        :param scratch: optional caller-owned C-contiguous uint8 array of shape (height, width, 3) that the pixels are
+        copied into and modified in, so repeated embeds into same-sized images reuse one buffer. Its contents are
+        overwritten
         """
-        img = Image.open(inputImagePath).convert("RGB")
-        pixels = np.array(img)
+        img = inputImagePath if isinstance(inputImagePath, Image.Image) else Image.open(inputImagePath)
+        # one bit per RGB channel value, checked from the size alone (Image.open only reads the header), so nothing is
+        # decoded, copied or unpacked for a payload that doesn't fit
+        if 32 + 8 * len(data) > img.width * img.height * 3:
+            raise ValueError("Data too large for image capacity")
 
-        binaryData = self.bytesToBinaryHelper(data)
+        if img.mode != "RGB":  # only read from below, so an RGB image is used as it is, without a converted copy
+            img = img.convert("RGB")
 
-        if len(binaryData) > pixels.size * 3:
-            raise ValueError("Data too large for image capacity")
+        # reshape(-1) below must be a view for the writes to land in the buffer, so only a C-contiguous
+        # writable scratch is used
+        if (scratch is not None and scratch.shape == (img.height, img.width, 3) and scratch.dtype == np.uint8
+                and scratch.flags.c_contiguous and scratch.flags.writeable):
+            pixels = scratch
+            np.copyto(pixels, np.asarray(img))
+        else:
+            pixels = np.array(img)
 
-        # embed bits into LSB
-        dataIndex = 0
-        for row in range(img.height):
-            for col in range(img.width):
-                for channel in range(3):
-                    if dataIndex < len(binaryData):
-                        pixels[row, col, channel] = (pixels[row, col, channel] & 254) | int(binaryData[dataIndex])
-                        dataIndex += 1
+        # the same bits as bytesToBitsHelper, kept packed and only unpacked a chunk at a time, so a large payload
+        # never needs one uint8 per bit all at once
+        packed = np.frombuffer(b"".join((len(data).to_bytes(4, 'big'), data)), dtype=np.uint8)
+        # a view in row, column, channel order, writes go straight into pixels. it is already one contiguous run of
+        # uint8, and that interleaved order is where the bits live in the image, so the channels aren't split apart
+        flatPixels = pixels.reshape(-1)
+        for start in range(0, packed.size, self.EMBED_CHUNK_BYTES):
+            bits = np.unpackbits(packed[start: start + self.EMBED_CHUNK_BYTES])
+            chunkPixels = flatPixels[start * 8: start * 8 + bits.size]
+            bits ^= chunkPixels & 1  # 1 where the LSB has to flip
+            chunkPixels ^= bits
 
-        Image.fromarray(pixels).save(outputImagePath)
+        Image.fromarray(pixels).save(outputImagePath, compress_level=self.PNG_COMPRESS_LEVEL)
         print(f"Embedded {len(data)} bytes into {outputImagePath}")
 
     def binaryToBytesHelper(self, binaryString: str) -> bytes:
@@ -52,8 +81,11 @@ class Steganography:
         :param binaryString: binary string to be converted to bytes
         :return: converted bytes
         """
-        paddedString = binaryString.ljust((len(binaryString) + 7) // 8 * 8, '0')
-        return bytes(int(paddedString[i:i + 8], 2) for i in range(0, len(paddedString), 8))
+        byteCount = (len(binaryString) + 7) // 8
+        if byteCount == 0:
+            return b""
+        # parsed as one big integer in a single C loop instead of one int() per byte
+        return int(binaryString.ljust(byteCount * 8, '0'), 2).to_bytes(byteCount, 'big')
 
     def extract(self, steganographicImagePath: str) -> bytes:
         """
@@ -61,15 +93,14 @@ class Steganography:
         :param steganographicImagePath:
         :return:
         """
-        img = Image.open(steganographicImagePath).convert("RGB")
-        pixels = np.array(img)
-
-        binaryString = ''.join(str(pixels[row, col, channel] & 1)
-                               for row in range(img.height)
-                               for col in range(img.width)
-                               for channel in range(3))
+        img = Image.open(steganographicImagePath)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        pixels = np.asarray(img)  # only read, so no writable copy of the decoded pixels is needed
 
-        dataLen = int(binaryString[:32], 2)
-        dataBits = binaryString[32: 32 + (dataLen * 8)]
+        flatPixels = pixels.reshape(-1)  # channel values in row, column, channel order
 
-        return self.binaryToBytesHelper(dataBits)
\ No newline at end of file
+        # the 32 bit header gives the payload size, so only the values carrying the payload are read, not the image.
+        # their LSBs are packed back 8 to a byte, most significant bit first, as bytesToBinaryHelper wrote them
+        dataLen = int(np.packbits(flatPixels[:32] & 1).view('>u4')[0])
+        return np.packbits(flatPixels[32: 32 + (dataLen * 8)] & 1).tobytes()
\ No newline at end of file
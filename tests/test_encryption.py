@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from encryption import AESEncryptorAndDecryptor, ChessKeyGenerator
+from steganography import Steganography
+
+
+def decryptSample(cipherImage: str, keyImage: str) -> str:
+    """
+    decrypts one of the sample image pairs shipped with the repo
+    :param cipherImage: file name of the cipher board image
+    :param keyImage: file name of the key board image
+    :return: decrypted message
+    """
+    stego = Steganography()
+    moves = stego.extract(os.path.join(REPO_DIR, keyImage)).decode('utf-8')
+    cipherText = stego.extract(os.path.join(REPO_DIR, cipherImage))
+    return AESEncryptorAndDecryptor(ChessKeyGenerator(moves).generateKey()).decryptStr(cipherText)
+
+
+class RemovePaddingTest(unittest.TestCase):
+    def setUp(self):
+        self.aes = AESEncryptorAndDecryptor(ChessKeyGenerator("e4 e5 Nf3").generateKey())
+
+    def testValidPaddingIsStripped(self):
+        for length in range(1, 17):
+            padded = b"x" * (16 - length) + bytes([length]) * length
+            self.assertEqual(bytes(self.aes.removePadding(padded)), b"x" * (16 - length))
+
+    def testInvalidPaddingRaises(self):
+        # earlier versions sliced off inputBytes[-1] bytes blindly and returned b"" or a truncated message
+        for padded in (b"", b"x" * 15 + b"\x00", b"x" * 15 + b"\x11", b"x" * 14 + b"\x01\x02", b"\x20" * 16):
+            with self.assertRaises(ValueError):
+                self.aes.removePadding(padded)
+
+    def testMatchingSamplePairDecrypts(self):
+        self.assertEqual(decryptSample("cipher_board.png", "key_board.png"), "i am good today")
+
+    def testMismatchedSamplePairRaises(self):
+        # the key image is from a different game than the cipher image, this used to decrypt to ''
+        with self.assertRaisesRegex(ValueError, "Invalid padding"):
+            decryptSample("cipher_board_bobby_fisher.png", "1990_bobby_fisher_game_keys.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
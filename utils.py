@@ -1,8 +1,12 @@
 # =================================================IMPORT STATEMENTS====================================================
 import chess
 import chess.pgn
-from PIL import Image, ImageDraw
+from PIL import Image
+import numpy as np
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import StringIO
 
 from chess import PIECE_SYMBOLS
@@ -32,14 +36,64 @@ chessPieceImages = {
     'P': os.path.join(base_path, 'PW.png')
 }
 
+# checked once here instead of a stat() per piece per board, boards are still drawn without the missing pieces
+missingPieceImages = {symbol for symbol, imgPath in chessPieceImages.items() if not os.path.isfile(imgPath)}
 
-def generateBoardImage(FEN: str, fileName: str, squareSize = 50):
+MOVE_NUMBER_PATTERN = re.compile(r'\d+\.+')  # "12." or "12..." tokens of a move list
+UCI_MOVE_PATTERN = re.compile(r'[a-h][1-8][a-h][1-8][qrbn]?')  # "g1f3" or "e7e8q" tokens, no SAN parsing needed
+
+LIGHT_SQUARE_COLOR = (240, 217, 181)
+DARK_SQUARE_COLOR = (181, 136, 99)
+
+
+@lru_cache(maxsize=64)
+def loadPieceImage(symbol: str, squareSize: int):
+    """
+    loads and resizes the image of one piece, cached so each piece image is only decoded once per square size.
+    the returned image is shared, so it is only pasted from, never modified
+    :param symbol: piece symbol, a key of chessPieceImages
+    :param squareSize: size in pixel of each square in the chess board
+    :return: RGBA image of the piece, squareSize by squareSize
+    """
+    return Image.open(chessPieceImages[symbol]).convert("RGBA").resize((squareSize, squareSize))
+
+
+@lru_cache(maxsize=8)
+def boardBackground(squareSize: int) -> np.ndarray:
+    """
+    builds the empty chess board, cached so the squares are only drawn once per square size.
+    the returned array is shared and read-only
+    :param squareSize: size in pixel of each square in the chess board
+    :return: uint8 array of shape (8 * squareSize, 8 * squareSize, 3)
+    """
+    # colours of the 64 squares, then each square is blown up to squareSize by squareSize pixels
+    squareIndex = np.arange(8)
+    isDark = (squareIndex[:, None] + squareIndex[None, :]) % 2 == 1
+    squares = np.where(isDark[..., None], np.uint8(DARK_SQUARE_COLOR), np.uint8(LIGHT_SQUARE_COLOR))
+    background = squares.repeat(squareSize, axis=0).repeat(squareSize, axis=1)
+    background.flags.writeable = False
+    return background
+
+
+@lru_cache(maxsize=8)
+def boardBackgroundImage(squareSize: int):
+    """
+    boardBackground as a PIL image, cached as well since Image.copy() is several times cheaper than converting the
+    array again. the returned image is shared, so it is only copied, never drawn on
+    :param squareSize: size in pixel of each square in the chess board
+    :return: RGB image of the empty chess board
+    """
+    return Image.fromarray(boardBackground(squareSize))
+
+
+def generateBoardImage(FEN: str, fileName: str = None, squareSize = 50):
     """
     Generates a chess board image with pieces in it
-    :param FEN: Forsyth-Edwards Notation that represents the chess board
+    :param FEN: Forsyth-Edwards Notation that represents the chess board, or only its piece placement part
     example: (rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1)
-    :param fileName: name of the file where we will save the chess board image
+    :param fileName: name of the file where we will save the chess board image, None to only return the image
     :param squareSize: size in pixel of each square in the chess board
+    :return: the generated board image
     """
     try:
         board = chess.Board(FEN)
@@ -47,22 +101,8 @@ def generateBoardImage(FEN: str, fileName: str, squareSize = 50):
         board = chess.Board()
         print(f"Invalid FEN: {FEN}, since given FEN is incorrect, we are using starting position")
 
-    img = Image.new("RGB", (8 * squareSize, 8 * squareSize))
-    imageDrawObject = ImageDraw.Draw(img)
-
     # draw chess board
-    for row in range(8):
-        for col in range(8):
-            if (row + col) % 2 == 0:
-                color = (240, 217, 181)
-            else:
-                color = (181, 136, 99)
-            imageDrawObject.rectangle([
-                col * squareSize,
-                row * squareSize,
-                (col + 1) * squareSize,
-                (row + 1) * squareSize
-            ], fill=color)
+    img = boardBackgroundImage(squareSize).copy()
 
     # draw pieces
     for square in chess.SQUARES:
@@ -71,28 +111,116 @@ def generateBoardImage(FEN: str, fileName: str, squareSize = 50):
             symbol = piece.symbol()
             if symbol in chessPieceImages:
                 imgPath =chessPieceImages[symbol]
-                if os.path.exists(imgPath):
+                if symbol not in missingPieceImages:
                     x = chess.square_file(square) * squareSize
                     y = (7 - chess.square_rank(square)) * squareSize
                     try:
-                        pieceImage = Image.open(imgPath).convert("RGBA").resize((squareSize, squareSize))
+                        pieceImage = loadPieceImage(symbol, squareSize)
                         img.paste(pieceImage, (x, y), pieceImage)
                     except Exception as e:
                         print(f"Error loading {imgPath}: {str(e)}")
                 else:
                     print(f"Missing Image: {imgPath}")
 
-    img.save(fileName)
-    print(f"Generated Board Image: {fileName}")
+    if fileName is not None:
+        img.save(fileName)
+        print(f"Generated Board Image: {fileName}")
+    return img
+
+
+def generateBoardImages(FENs: list, fileNames: list, squareSize = 50, workers: int = None) -> list:
+    """
+    generates and saves several chess board images at once, each one rendered and saved by its own thread. Pillow
+    releases the GIL while encoding the PNG, and the piece images and background are shared through their caches
+    :param FENs: Forsyth-Edwards Notation of each board, as for generateBoardImage
+    :param fileNames: name of the file each board is saved to, one per FEN
+    :param squareSize: size in pixel of each square in the chess board
+    :param workers: maximum number of threads, None lets the executor decide
+    :return: the generated board images, in the order of FENs
+    """
+    def generateAndSave(FEN, fileName):
+        img = generateBoardImage(FEN, squareSize=squareSize)
+        img.save(fileName)
+        return img
 
+    # two boards going to the same file are written one after the other, so the last one wins as it would in a loop
+    if len({os.path.abspath(fileName) for fileName in fileNames}) < len(fileNames):
+        workers = 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        images = list(executor.map(generateAndSave, FENs, fileNames))
 
-def getGamePositions(moves: str):
+    for fileName in fileNames:  # printed here rather than by the threads, so always in order
+        print(f"Generated Board Image: {fileName}")
+    return images
+
+
+def rankFen(board: chess.Board, rank: int) -> str:
+    """
+    builds the piece placement of one rank, the way it appears between the slashes of a FEN
+    :param board: board to read the pieces from
+    :param rank: index of the rank, 0 for rank 1 up to 7 for rank 8
+    :return: placement of the rank, e.g. "2n2n2"
+    """
+    parts = []
+    empty = 0
+    for square in range(rank * 8, rank * 8 + 8):
+        piece = board.piece_at(square)
+        if piece is None:
+            empty += 1
+        else:
+            if empty:
+                parts.append(str(empty))
+                empty = 0
+            parts.append(piece.symbol())
+    if empty:
+        parts.append(str(empty))
+    return ''.join(parts)
+
+
+def positionFen(board: chess.Board, ranks: list) -> str:
+    """
+    builds the same FEN as board.fen(), from the placement of each rank kept up to date by the caller, so only the
+    ranks a move touched need rebuilding instead of scanning all 64 squares again
+    :param board: board the FEN is for
+    :param ranks: rankFen of each rank of the board, rank 1 first
+    :return: FEN of the board
+    """
+    enPassant = '-'
+    if board.ep_square is not None and board.has_legal_en_passant():
+        enPassant = chess.SQUARE_NAMES[board.ep_square]
+    return (f"{'/'.join(reversed(ranks))} {'w' if board.turn else 'b'} {board.castling_xfen()} {enPassant} "
+            f"{board.halfmove_clock} {board.fullmove_number}")
+
+
+def getGamePositions(moves: str, full: bool = True):
     """
     takes a string of chess moves (in algebraic notation) and returns a list of FEN strings representing the
     board position after each move.
     :param moves: string of moves to be parsed
+    :param full: False to only get the piece placement part of each FEN (what generateBoardImage draws), which skips
+    working out the side to move, castling rights, en passant square and clocks after every move
     :return: list of FEN positions
     """
+    # a plain list of moves (optionally numbered) is pushed straight onto a board, without the full PGN parser
+    try:
+        board = chess.Board()
+        ranks = [rankFen(board, rank) for rank in range(8)]
+        positions = []
+
+        for token in moves.split():
+            if not MOVE_NUMBER_PATTERN.fullmatch(token):
+                move = board.push_uci(token) if UCI_MOVE_PATTERN.fullmatch(token) else board.push_san(token)
+                # every square a move changes (castling rook and en passant capture included) is on the rank it
+                # starts from or the rank it ends on
+                for rank in {chess.square_rank(move.from_square), chess.square_rank(move.to_square)}:
+                    ranks[rank] = rankFen(board, rank)
+                positions.append(positionFen(board, ranks) if full else '/'.join(reversed(ranks)))
+
+        return positions
+
+    except ValueError:
+        pass  # comments, results, an illegal move, ...: left to read_game, which handles them as it always has
+
     try:
         game = chess.pgn.read_game(StringIO(f"1. {moves}"))
         board = game.board()
@@ -100,10 +228,10 @@ def getGamePositions(moves: str):
 
         for move in game.mainline_moves():
             board.push(move)
-            positions.append(board.fen())
+            positions.append(board.fen() if full else board.board_fen())
 
         return positions
 
     except Exception as e:
         print(f"Error parsing {moves}: {str(e)}")
-        return [chess.Board().fen()]
\ No newline at end of file
+        return [chess.Board().fen() if full else chess.Board().board_fen()]
\ No newline at end of file